@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from .cache import bump_list_version, bump_versions_for_posts
 from .models import Comment, Post
 
 
@@ -54,10 +55,15 @@ class CommentAdmin(admin.ModelAdmin):
     actions = ["make_published", "make_unpublished"]
 
     def make_published(self, request, queryset):
-        queryset.update(published=True)
+        # QuerySet.update() does not send post_save, so invalidate explicitly.
+        post_ids = Comment.objects.set_published(queryset, True)
+        bump_versions_for_posts(post_ids)
+        bump_list_version()
 
     def make_unpublished(self, request, queryset):
-        queryset.update(published=False)
+        post_ids = Comment.objects.set_published(queryset, False)
+        bump_versions_for_posts(post_ids)
+        bump_list_version()
 
 
 admin.site.register(Post, PostAdmin)
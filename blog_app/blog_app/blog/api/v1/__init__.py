@@ -1 +1,3 @@
-from .views import comments_list_view, post_lists_view, post_retrieve_view
+from .views import (comments_list_view, post_archive_month_view,
+                    post_archive_view, post_batch_view, post_lists_view,
+                    post_retrieve_view, post_search_view)
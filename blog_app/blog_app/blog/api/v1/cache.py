@@ -0,0 +1,161 @@
+import hashlib
+import math
+
+from rest_framework import status
+
+from blog_app.core.compression import (compress, encode_response,
+                                       get_accepted_encoding, is_compression_enabled)
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import parse_http_date_safe
+
+from ...cache import get_cache, get_cache_settings, get_versions, is_cache_enabled
+from .rows import JSONBytesResponse
+
+RESPONSE_KEY = "blog:response:{}"
+BOUNDARY_KEY = "blog:boundary:{}"
+CACHED_HEADERS = ("ETag", "Last-Modified")
+
+
+class CachedResponseMixin:
+    """
+    Cache the rendered JSON bytes of successful GET responses.
+
+    Keys are built from the host, the path, the query string, the Accept header
+    and the versions returned by `get_cache_version_keys`. Writes bump those versions
+    (see `blog_app.blog.signals`), so stale entries are never read again and
+    simply expire.
+
+    Scheduled content becomes visible without any write, so entries also never
+    outlive the moment returned by `get_visibility_boundary`.
+
+    Compressed variants of the body are stored in the same entry, so hits are
+    served without compressing again.
+    """
+
+    def get_cache_version_keys(self, **kwargs):
+        raise NotImplementedError
+
+    def get_visibility_boundary(self, **kwargs):
+        """
+        Return when the cached response may change without a write, or None.
+        """
+        return None
+
+    def get_cache_timeout(self, **kwargs):
+        timeout = get_cache_settings().get("TIMEOUT", 300)
+        boundary = self.get_cached_visibility_boundary(**kwargs)
+        if boundary is None:
+            return timeout
+        seconds = math.ceil((boundary - timezone.now()).total_seconds())
+        return max(1, min(timeout, seconds))
+
+    def get_cached_visibility_boundary(self, **kwargs):
+        """
+        Memoise `get_visibility_boundary` under the same versions as the
+        response, so a miss on another page does not look it up again.
+        """
+        version_keys = self.get_cache_version_keys(**kwargs)
+        versions = get_versions(version_keys)
+        parts = [type(self).__name__] + version_keys + [str(v) for v in versions]
+        # A batch of slugs would go past the key length memcached accepts.
+        digest = hashlib.md5("\n".join(parts).encode("utf-8")).hexdigest()
+        key = BOUNDARY_KEY.format(digest)
+        cache = get_cache()
+        cached = cache.get(key)
+        if cached is not None and (
+            cached["boundary"] is None or cached["boundary"] > timezone.now()
+        ):
+            return cached["boundary"]
+
+        boundary = self.get_visibility_boundary(**kwargs)
+        cache.set(key, {"boundary": boundary}, get_cache_settings().get("TIMEOUT", 300))
+        return boundary
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method != "GET" or not is_cache_enabled():
+            return super().dispatch(request, *args, **kwargs)
+
+        key = self.get_response_cache_key(request, **kwargs)
+        cached = get_cache().get(key)
+        if cached is not None:
+            return self.build_cached_response(request, cached)
+
+        response = super().dispatch(request, *args, **kwargs)
+        if self.is_cacheable(response):
+            timeout = self.get_cache_timeout(**kwargs)
+            if isinstance(response, JSONBytesResponse):
+                self.store_response(request, key, response, timeout)
+            else:
+                response.add_post_render_callback(
+                    lambda rendered: self.store_response(
+                        request, key, rendered, timeout
+                    )
+                )
+        return response
+
+    def get_response_cache_key(self, request, **kwargs):
+        versions = get_versions(self.get_cache_version_keys(**kwargs))
+        parts = [
+            # Pagination links are absolute, so they depend on the host.
+            request.get_host(),
+            request.path,
+            "&".join(sorted(request.GET.urlencode().split("&"))),
+            request.META.get("HTTP_ACCEPT", ""),
+        ] + [str(version) for version in versions]
+        digest = hashlib.md5("\n".join(parts).encode("utf-8")).hexdigest()
+        return RESPONSE_KEY.format(digest)
+
+    def is_cacheable(self, response):
+        if response.status_code != status.HTTP_200_OK:
+            return False
+        if isinstance(response, JSONBytesResponse):
+            return True
+        renderer = getattr(response, "accepted_renderer", None)
+        return renderer is not None and renderer.format == "json"
+
+    def store_response(self, request, key, response, timeout):
+        """
+        Cache the body with its compressed variants, then send the variant
+        the client accepts so it is not compressed twice.
+        """
+        cached = {
+            "content": response.content,
+            "encodings": (
+                compress(response.content) if is_compression_enabled(request) else {}
+            ),
+            "content_type": response["Content-Type"],
+            "headers": {
+                header: response[header]
+                for header in CACHED_HEADERS
+                if response.has_header(header)
+            },
+        }
+        get_cache().set(key, cached, timeout)
+        self.encode_cached_response(request, response, cached)
+
+    def build_cached_response(self, request, cached):
+        headers = cached["headers"]
+        not_modified = get_conditional_response(
+            request,
+            etag=headers.get("ETag"),
+            last_modified=parse_http_date_safe(headers.get("Last-Modified")),
+        )
+        if not_modified is not None:
+            return not_modified
+
+        response = HttpResponse(cached["content"], content_type=cached["content_type"])
+        for header, value in headers.items():
+            response[header] = value
+        return self.encode_cached_response(request, response, cached)
+
+    def encode_cached_response(self, request, response, cached):
+        encodings = cached.get("encodings")
+        if not encodings:
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = get_accepted_encoding(request, encodings)
+        if encoding is not None:
+            encode_response(response, encoding, encodings[encoding])
+        return response
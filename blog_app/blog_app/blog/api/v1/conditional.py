@@ -0,0 +1,38 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+CONDITIONAL_HEADERS = ("HTTP_IF_NONE_MATCH", "HTTP_IF_MODIFIED_SINCE")
+
+
+def is_conditional(request):
+    return any(header in request.META for header in CONDITIONAL_HEADERS)
+
+
+def make_etag(*parts):
+    value = ":".join(str(part) for part in parts)
+    return '"{}"'.format(hashlib.md5(value.encode("utf-8")).hexdigest())
+
+
+def get_not_modified_response(request, etag, last_modified=None):
+    """
+    Return a 304 (or 412) response when the request validators match,
+    otherwise None.
+    """
+    return get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=_timestamp(last_modified),
+    )
+
+
+def set_validators(response, etag, last_modified=None):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(_timestamp(last_modified))
+    return response
+
+
+def _timestamp(value):
+    return int(value.timestamp()) if value is not None else None
@@ -0,0 +1,170 @@
+import base64
+import json
+from collections import OrderedDict
+from datetime import datetime
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (BasePagination, LimitOffsetPagination,
+                                       _positive_int)
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on the values of the `ordering` fields.
+
+    Pages are fetched with a `WHERE (a, b) < (x, y)` style predicate instead of
+    an OFFSET, and no total count is computed, so every page costs the same
+    single query regardless of how deep the client walks.
+    """
+
+    ordering = ("-publish_date", "-id")
+    # Type of the value of each `ordering` field in a cursor.
+    cursor_types = (datetime, int)
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        ordering = self._reverse_ordering() if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._keyset_filter(position, reverse))
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._build_link(self.encode_cursor(self.page[-1], reverse=False))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self._build_link(self.encode_cursor(self.page[0], reverse=True))
+
+    def encode_cursor(self, instance, reverse):
+        position = []
+        for field in self.ordering:
+            value = getattr(instance, field.lstrip("-"))
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            position.append(value)
+        payload = json.dumps({"p": position, "r": int(reverse)}).encode("utf-8")
+        return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            padding = "=" * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(encoded + padding))
+            if len(payload["p"]) != len(self.cursor_types):
+                raise ValueError(payload["p"])
+            position = [
+                self._decode_value(value, kind)
+                for value, kind in zip(payload["p"], self.cursor_types)
+            ]
+            reverse = bool(payload["r"])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def _decode_value(self, value, kind):
+        """
+        Check that `value` can be compared with a field of type `kind`, so a
+        forged cursor is answered 404 instead of failing in the query.
+        """
+        if kind is datetime:
+            parsed = parse_datetime(value) if isinstance(value, str) else None
+            if parsed is None:
+                raise ValueError(value)
+            return parsed
+        if isinstance(value, bool):
+            raise ValueError(value)
+        if kind is int and isinstance(value, int):
+            return value
+        if kind is float and isinstance(value, (int, float)):
+            return float(value)
+        raise ValueError(value)
+
+    def _reverse_ordering(self):
+        return tuple(
+            field[1:] if field.startswith("-") else "-" + field
+            for field in self.ordering
+        )
+
+    def _keyset_filter(self, position, reverse):
+        condition = Q()
+        equal = {}
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") != reverse else "gt"
+            condition |= Q(**equal, **{"{}__{}".format(name, lookup): value})
+            equal[name] = value
+        return condition
+
+    def _build_link(self, cursor):
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+
+class CommentCursorPagination(KeysetPagination):
+    page_size = 50
+
+
+class SearchCursorPagination(KeysetPagination):
+    ordering = ("-rank", "-id")
+    cursor_types = (float, int)
+
+
+class CappedLimitOffsetPagination(LimitOffsetPagination):
+    """
+    Offset pagination of old clients, with pages no larger than cursor pages.
+    """
+
+    max_limit = KeysetPagination.max_page_size
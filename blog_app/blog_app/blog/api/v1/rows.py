@@ -0,0 +1,153 @@
+import json
+from functools import lru_cache
+
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from blog_app.core.timing import measure
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils import timezone
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def dumps(data):
+    """
+    Encode `data` to JSON bytes, with orjson when it is installed and
+    otherwise exactly like DRF's `JSONRenderer`.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    separators = (",", ":") if api_settings.COMPACT_JSON else (", ", ": ")
+    content = json.dumps(
+        data,
+        ensure_ascii=not api_settings.UNICODE_JSON,
+        allow_nan=not api_settings.STRICT_JSON,
+        separators=separators,
+    )
+    content = content.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
+    return content.encode("utf-8")
+
+
+class JSONBytesResponse(HttpResponse):
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(dumps(data), **kwargs)
+
+
+class RowSerializer:
+    """
+    Produce the output of `serializer_class(many=True)` from the named tuples of
+    `values_list(*fields, named=True)`, without building model instances or
+    running the serializer fields one by one.
+
+    Only plain model fields are supported. Datetimes with a strftime
+    `DATETIME_FORMAT` are formatted inline in the current timezone, any other
+    value goes through the serializer field.
+    """
+
+    def __init__(self, serializer_class, fields=None):
+        serializer = (
+            serializer_class() if fields is None else serializer_class(fields=fields)
+        )
+        self.columns = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            convert = None
+            if isinstance(field, serializers.DateTimeField):
+                convert = self._datetime_converter(field)
+            self.columns.append((name, field.source, convert))
+        self.fields = tuple(source for _, source, _ in self.columns)
+
+    def _datetime_converter(self, field):
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        if (
+            output_format is None
+            or output_format.lower() == ISO_8601
+            or hasattr(field, "timezone")
+            or not settings.USE_TZ
+        ):
+            return field.to_representation
+        return output_format
+
+    def get_query_fields(self, paginator=None):
+        """
+        Columns to select: the serialized fields and those the paginator needs
+        to build its cursors.
+        """
+        fields = list(self.fields)
+        for field in getattr(paginator, "ordering", ()):
+            name = field.lstrip("-")
+            if name not in fields:
+                fields.append(name)
+        return fields
+
+    def to_representation(self, rows):
+        current_timezone = timezone.get_current_timezone()
+        columns = self.columns
+        data = []
+        for row in rows:
+            item = {}
+            for name, source, convert in columns:
+                value = getattr(row, source)
+                if convert is None or value is None:
+                    item[name] = value
+                elif isinstance(convert, str):
+                    item[name] = value.astimezone(current_timezone).strftime(convert)
+                else:
+                    item[name] = convert(value)
+            data.append(item)
+        return data
+
+
+@lru_cache(maxsize=None)
+def get_row_serializer(serializer_class, fields=None):
+    return RowSerializer(serializer_class, fields)
+
+
+class RowListMixin:
+    """
+    Render read-only lists straight from `values_list()` rows when the
+    response is JSON; the browsable API keeps using the serializer.
+
+    Either way only the columns of the serialized `fields`, all by default,
+    and of the paginator ordering are selected.
+    """
+
+    def list_response(
+        self, request, queryset, serializer_class, paginator=None, fields=None
+    ):
+        row_serializer = get_row_serializer(serializer_class, fields)
+        query_fields = row_serializer.get_query_fields(paginator)
+        if request.accepted_renderer.format != "json":
+            model_fields = {field.name for field in queryset.model._meta.fields}
+            queryset = queryset.only(
+                *(name for name in query_fields if name in model_fields)
+            )
+            page = self._paginate(request, queryset, paginator)
+            kwargs = {} if fields is None else {"fields": fields}
+            with measure("serializer"):
+                data = serializer_class(page, many=True, **kwargs).data
+            return self._response(data, paginator)
+
+        queryset = queryset.values_list(*query_fields, named=True)
+        page = self._paginate(request, queryset, paginator)
+        with measure("serializer"):
+            data = row_serializer.to_representation(page)
+        return JSONBytesResponse(self._response(data, paginator).data)
+
+    def _paginate(self, request, queryset, paginator):
+        if paginator is None:
+            return queryset
+        return paginator.paginate_queryset(queryset, request, view=self)
+
+    def _response(self, data, paginator):
+        if paginator is None:
+            return Response(data)
+        return paginator.get_paginated_response(data)
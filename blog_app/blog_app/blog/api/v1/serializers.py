@@ -1,19 +1,56 @@
 from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
 
-from ...models import Comment, Post
+from ...models import ArchiveMonth, Comment, Post
 
 
-class ListPostSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """
+    Let the `fields` argument keep only some of the serializer fields.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+def get_requested_fields(request, serializer_class):
+    """
+    Parse the optional comma separated `fields` parameter into a tuple of
+    `serializer_class` fields in their declared order, or None if not sent.
+    """
+    value = request.query_params.get("fields")
+    if value is None:
+        return None
+    requested = {name for name in value.split(",") if name}
+    available = serializer_class.Meta.fields
+    unknown = requested.difference(available)
+    if not requested or unknown:
+        message = "Choose fields from: {}.".format(", ".join(available))
+        raise ValidationError({"fields": [message]})
+    return tuple(name for name in available if name in requested)
+
+
+class ListPostSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Post
-        fields = ("title", "slug", "summary", "publish_date")
+        fields = (
+            "title",
+            "slug",
+            "summary",
+            "publish_date",
+            "comment_count",
+            "last_comment_at",
+        )
         lookup_field = "slug"
 
 
-class RetrievePostSerializer(serializers.ModelSerializer):
+class RetrievePostSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Post
-        fields = ("title", "summary", "content", "publish_date")
+        fields = ("title", "summary", "content", "content_html", "publish_date")
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -24,3 +61,12 @@ class CommentSerializer(serializers.ModelSerializer):
         extra_kwargs = {
             "email": {"write_only": True},
         }
+
+
+class ArchiveMonthSerializer(serializers.ModelSerializer):
+    year = serializers.IntegerField(source="month.year")
+    month = serializers.IntegerField(source="month.month")
+
+    class Meta:
+        model = ArchiveMonth
+        fields = ("year", "month", "post_count")
@@ -0,0 +1,100 @@
+import hashlib
+import math
+import time
+
+from rest_framework.throttling import BaseThrottle
+
+from django.conf import settings
+
+from ...cache import get_cache
+
+THROTTLE_KEY = "blog:throttle:{}:{}"
+DUPLICATE_KEY = "blog:comment:{}"
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def get_throttling_settings():
+    return getattr(settings, "BLOG_COMMENT_THROTTLING", {})
+
+
+def parse_rate(rate):
+    """
+    Turn a "number/period" rate such as "10/min" into tokens per second.
+    """
+    number, period = rate.split("/")
+    return int(number) / PERIODS[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token bucket of BLOG_COMMENT_THROTTLING["BURSTS"][scope] tokens, refilled at
+    BLOG_COMMENT_THROTTLING["RATES"][scope].
+
+    Buckets live in the blog cache, so they are shared by all processes when
+    the cache is. Updates are not atomic: concurrent requests may take the
+    same token, which is acceptable for spam control.
+    """
+
+    scope = None
+
+    def get_bucket_id(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        options = get_throttling_settings()
+        if not options.get("ENABLED", False):
+            return True
+
+        refill = parse_rate(options["RATES"][self.scope])
+        capacity = options["BURSTS"][self.scope]
+        key = THROTTLE_KEY.format(self.scope, self.get_bucket_id(request, view))
+        cache = get_cache()
+        now = time.time()
+        tokens, updated = cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        else:
+            self.wait_seconds = (1 - tokens) / refill
+        # A bucket left alone until it is full again is the same as no bucket.
+        cache.set(key, (tokens, now), math.ceil((capacity - tokens) / refill) + 1)
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class CommentIPThrottle(TokenBucketThrottle):
+    scope = "ip"
+
+    def get_bucket_id(self, request, view):
+        return self.get_ident(request)
+
+
+class CommentPostThrottle(TokenBucketThrottle):
+    scope = "post"
+
+    def get_bucket_id(self, request, view):
+        return view.kwargs["slug"]
+
+
+def claim_comment(post_id, email, body):
+    """
+    Reserve the content hash of a comment for
+    BLOG_COMMENT_THROTTLING["DUPLICATE_WINDOW"] seconds. Return its key, or
+    None if the same comment was submitted to the post within that window.
+    """
+    content = "\n".join([str(post_id), email.strip().lower(), body.strip()])
+    key = DUPLICATE_KEY.format(hashlib.sha256(content.encode("utf-8")).hexdigest())
+    options = get_throttling_settings()
+    window = options.get("DUPLICATE_WINDOW", 0)
+    if options.get("ENABLED", False) and window:
+        if not get_cache().add(key, 1, window):
+            return None
+    return key
+
+
+def release_comment(key):
+    get_cache().delete(key)
@@ -1,80 +1,404 @@
+import datetime
+
 from rest_framework import status
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from blog_app.core.timing import measure
+from django.db.models import OuterRef, Subquery
 from django.http import Http404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
-from ...models import Post
-from .serializers import (CommentSerializer, ListPostSerializer,
-                          RetrievePostSerializer)
+from ...cache import LIST_VERSION_KEY, get_next_publish_date, post_version_key
+from ...ingestion import get_comment_queue, is_queued_ingestion_enabled
+from ...models import ArchiveMonth, Comment, Post, get_month_range
+from ...negative_cache import hidden_slugs
+from .cache import CachedResponseMixin
+from .conditional import (get_not_modified_response, is_conditional,
+                          make_etag, set_validators)
+from .pagination import (CappedLimitOffsetPagination, CommentCursorPagination,
+                         KeysetPagination, SearchCursorPagination)
+from .rows import RowListMixin
+from .serializers import (ArchiveMonthSerializer, CommentSerializer,
+                          ListPostSerializer, RetrievePostSerializer,
+                          get_requested_fields)
+from .throttling import (CommentIPThrottle, CommentPostThrottle, claim_comment,
+                         release_comment)
 
 
-class PostsList(APIView):
+class PostsList(RowListMixin, CachedResponseMixin, APIView):
     """
     View to list posts.
     """
 
     permission_classes = (AllowAny,)
 
+    def get_cache_version_keys(self, **kwargs):
+        return [LIST_VERSION_KEY]
+
+    def get_visibility_boundary(self, **kwargs):
+        return get_next_publish_date()
+
     def get(self, request):
+        fields = get_requested_fields(request, ListPostSerializer)
         posts = Post.objects.get_published_posts()
-        paginator = LimitOffsetPagination()
-        try:
-            result_page = paginator.paginate_queryset(posts, request)
-            serializer = ListPostSerializer(result_page, many=True)
-            return paginator.get_paginated_response(serializer.data)
-        except AttributeError:
-            serializer = ListPostSerializer(posts, many=True)
-            return Response(serializer.data, status.HTTP_200_OK)
+        paginator = self.get_paginator(request)
+        return self.list_response(request, posts, ListPostSerializer, paginator, fields)
+
+    def get_paginator(self, request):
+        """
+        Old clients opt in to offset pagination with `limit`/`offset`, other
+        requests get cursor pagination.
+        """
+        params = request.query_params
+        if "limit" in params or "offset" in params:
+            paginator = CappedLimitOffsetPagination()
+            if paginator.get_limit(request) is not None:
+                return paginator
+        return KeysetPagination()
 
 
 post_lists_view = PostsList.as_view()
 
 
-class PostMixin:
-    def get_object(self, slug):
+class PostSearch(RowListMixin, CachedResponseMixin, APIView):
+    """
+    View to search published posts, best matches first.
+    """
+
+    permission_classes = (AllowAny,)
+
+    def get_cache_version_keys(self, **kwargs):
+        return [LIST_VERSION_KEY]
+
+    def get_visibility_boundary(self, **kwargs):
+        return get_next_publish_date()
+
+    def get(self, request):
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            raise ValidationError({"q": ["This field is required."]})
+
+        fields = get_requested_fields(request, ListPostSerializer)
+        posts = Post.objects.search_published_posts(text)
+        return self.list_response(
+            request, posts, ListPostSerializer, SearchCursorPagination(), fields
+        )
+
+
+post_search_view = PostSearch.as_view()
+
+
+class PostArchive(CachedResponseMixin, APIView):
+    """
+    View to count visible posts per month, newest month first.
+    """
+
+    permission_classes = (AllowAny,)
+
+    def get_cache_version_keys(self, **kwargs):
+        return [LIST_VERSION_KEY]
+
+    def get_visibility_boundary(self, **kwargs):
+        return get_next_publish_date()
+
+    def get(self, request):
+        months = ArchiveMonth.objects.get_visible_months()
+        serializer = ArchiveMonthSerializer(months, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+post_archive_view = PostArchive.as_view()
+
+
+class PostArchiveMonth(RowListMixin, CachedResponseMixin, APIView):
+    """
+    View to list the published posts of a month.
+    """
+
+    permission_classes = (AllowAny,)
+
+    def get_cache_version_keys(self, **kwargs):
+        return [LIST_VERSION_KEY]
+
+    def get_visibility_boundary(self, **kwargs):
+        return get_next_publish_date()
+
+    def get(self, request, year=None, month=None):
         try:
-            post = Post.objects.get(slug=slug)
-            if post.is_published:
-                return post
-            else:
-                raise Http404
-        except Post.DoesNotExist:
+            start, end = get_month_range(datetime.date(year, month, 1))
+        except (ValueError, OverflowError):
             raise Http404
+        fields = get_requested_fields(request, ListPostSerializer)
+        # A range on publish_date of the published posts index.
+        posts = Post.objects.get_published_posts().filter(
+            publish_date__gte=start, publish_date__lt=end
+        )
+        return self.list_response(
+            request, posts, ListPostSerializer, KeysetPagination(), fields
+        )
+
+
+post_archive_month_view = PostArchiveMonth.as_view()
+
+
+class PostMixin:
+    def get_cache_version_keys(self, slug=None, **kwargs):
+        return [post_version_key(slug)]
+
+    def get_object(self, slug, fields=None):
+        """
+        Fetch a visible post in one query, loading only `fields` if given.
+        """
+        self.check_hidden(slug)
+        posts = Post.objects.get_published_posts()
+        if fields is not None:
+            posts = posts.only(*fields)
+        post = posts.filter(slug=slug).first()
+        if post is None:
+            self.hide(slug)
+        return post
+
+    def check_hidden(self, slug):
+        """
+        Raise Http404 without a query for slugs known to have no visible post.
+        """
+        if hidden_slugs.is_hidden(slug):
+            raise Http404
+
+    def hide(self, slug):
+        """
+        Remember that `slug` has no visible post, at most until the next
+        scheduled post becomes visible, and raise Http404.
+        """
+        hidden_slugs.add(slug, until=get_next_publish_date())
+        raise Http404
 
     class Meta:
         abstract = True
 
 
-class PostRetrieve(PostMixin, APIView):
+class PostRetrieve(PostMixin, CachedResponseMixin, APIView):
 
     permission_classes = (AllowAny,)
 
     def get(self, request, slug=None):
-        post = self.get_object(slug)
-        serializer = RetrievePostSerializer(post)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        fields = get_requested_fields(request, RetrievePostSerializer)
+        if is_conditional(request):
+            post_id, updated_at = self.get_validators(slug)
+            not_modified = get_not_modified_response(
+                request, self._make_etag(post_id, updated_at, fields), updated_at
+            )
+            if not_modified is not None:
+                return not_modified
+
+        # Large columns are not even fetched unless they are requested.
+        post = self.get_object(
+            slug,
+            fields=(fields or RetrievePostSerializer.Meta.fields) + ("updated_at",),
+        )
+        serializer = RetrievePostSerializer(post, fields=fields)
+        with measure("serializer"):
+            data = serializer.data
+        response = Response(data, status=status.HTTP_200_OK)
+        return set_validators(
+            response,
+            self._make_etag(post.pk, post.updated_at, fields),
+            post.updated_at,
+        )
+
+    def _make_etag(self, post_id, updated_at, fields):
+        parts = [post_id, updated_at.isoformat()]
+        # Each field set is a different representation.
+        if fields is not None:
+            parts.append(",".join(fields))
+        return make_etag(*parts)
+
+    def get_validators(self, slug):
+        self.check_hidden(slug)
+        validators = (
+            Post.objects.get_published_posts()
+            .filter(slug=slug)
+            .values_list("id", "updated_at")
+            .first()
+        )
+        if validators is None:
+            self.hide(slug)
+        return validators
 
 
 post_retrieve_view = PostRetrieve.as_view()
 
 
-class CommentsList(PostMixin, APIView):
+class PostBatch(CachedResponseMixin, APIView):
+    """
+    View to retrieve several posts by the comma separated `slugs` parameter.
+
+    Posts are returned by slug in the requested order, and slugs of posts
+    that do not exist or are not visible are listed in `missing`.
+    """
+
+    permission_classes = (AllowAny,)
+    max_slugs = 50
+
+    def get_cache_version_keys(self, **kwargs):
+        # Oversized batches are rejected by get(), bound the work done before.
+        slugs = self.get_slugs(self.request)[: self.max_slugs]
+        return [post_version_key(slug) for slug in slugs]
+
+    def get_visibility_boundary(self, **kwargs):
+        return (
+            Post.objects.filter(
+                slug__in=self.get_slugs(self.request)[: self.max_slugs],
+                status=Post.STATUS.PUBLISH,
+                publish_date__gt=timezone.now(),
+            )
+            .order_by("publish_date")
+            .values_list("publish_date", flat=True)
+            .first()
+        )
+
+    def get(self, request):
+        slugs = self.get_slugs(request)
+        if not slugs:
+            raise ValidationError({"slugs": ["This field is required."]})
+        if len(slugs) > self.max_slugs:
+            message = "Ensure this field has no more than {} slugs."
+            raise ValidationError({"slugs": [message.format(self.max_slugs)]})
+
+        fields = get_requested_fields(request, RetrievePostSerializer)
+        posts = (
+            Post.objects.get_published_posts()
+            .filter(slug__in=slugs)
+            .only(*(fields or RetrievePostSerializer.Meta.fields), "slug")
+        )
+        posts = {post.slug: post for post in posts}
+        with measure("serializer"):
+            results = {
+                slug: RetrievePostSerializer(posts[slug], fields=fields).data
+                for slug in slugs
+                if slug in posts
+            }
+        missing = [slug for slug in slugs if slug not in posts]
+        return Response(
+            {"results": results, "missing": missing}, status=status.HTTP_200_OK
+        )
+
+    def get_slugs(self, request):
+        """
+        Parse the `slugs` parameter, dropping empty and repeated slugs.
+        """
+        value = request.GET.get("slugs", "")
+        return list(dict.fromkeys(slug for slug in value.split(",") if slug))
+
+
+post_batch_view = PostBatch.as_view()
+
+
+class CommentsList(PostMixin, RowListMixin, CachedResponseMixin, APIView):
 
     permission_classes = (AllowAny,)
 
     def get(self, request, slug=None):
-        post = self.get_object(slug)
-        comments = post.get_published_comments()
-        serializer = CommentSerializer(comments, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        validators = self.get_validators(slug)
+        self.post_id, self.boundary = validators[0], validators[-1]
+        etag = make_etag(*validators, request.get_full_path())
+        not_modified = get_not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        comments = Comment.objects.get_published_comments(self.post_id)
+        since = self.get_since(request)
+        if since is not None:
+            comments = comments.filter(publish_date__gt=since)
+        response = self.list_response(
+            request, comments, CommentSerializer, CommentCursorPagination()
+        )
+        return set_validators(response, etag)
+
+    def get_since(self, request):
+        """
+        Parse the optional `since` parameter used to fetch only new comments.
+        """
+        value = request.query_params.get("since")
+        if not value:
+            return None
+        since = parse_datetime(value)
+        if since is None:
+            raise ValidationError({"since": ["Enter a valid date/time."]})
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        return since
+
+    def get_validators(self, slug):
+        """
+        Fetch the post id with its comment stats, which every comment change
+        updates, and the publish date of its next scheduled comment, which
+        becomes visible before blog_repair_comment_stats counts it.
+
+        There is no Last-Modified: a scheduled comment may be published with
+        an older date than the comments already visible.
+        """
+        self.check_hidden(slug)
+        next_comment = (
+            Comment.objects.filter(
+                post=OuterRef("pk"), published=True, publish_date__gt=timezone.now()
+            )
+            .order_by("publish_date")
+            .values("publish_date")[:1]
+        )
+        validators = (
+            Post.objects.get_published_posts()
+            .filter(slug=slug)
+            .annotate(boundary=Subquery(next_comment))
+            .values_list(
+                "id",
+                "comment_count",
+                "last_comment_at",
+                "comments_changed_at",
+                "boundary",
+            )
+            .first()
+        )
+        if validators is None:
+            self.hide(slug)
+        return validators
+
+    def get_visibility_boundary(self, **kwargs):
+        return self.boundary
+
+    def get_throttles(self):
+        if self.request.method == "POST":
+            return [CommentIPThrottle(), CommentPostThrottle()]
+        return super().get_throttles()
 
     def post(self, request, slug=None):
         serializer = CommentSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        post = self.get_object(slug)
+        post = self.get_object(slug, fields=("id",))
+        key = claim_comment(
+            post.pk,
+            serializer.validated_data["email"],
+            serializer.validated_data["body"],
+        )
+        if key is None:
+            raise ValidationError({"non_field_errors": ["Duplicate comment."]})
+        try:
+            return self.save_comment(serializer, post)
+        except Exception:
+            release_comment(key)
+            raise
+
+    def save_comment(self, serializer, post):
+        if is_queued_ingestion_enabled():
+            comment = dict(serializer.validated_data, post_id=post.pk)
+            get_comment_queue().put(comment)
+            data = {field: comment[field] for field in ("name", "body")}
+            return Response(data, status=status.HTTP_202_ACCEPTED)
+
         serializer.validated_data["post"] = post
         serializer.save()
         data = serializer.data
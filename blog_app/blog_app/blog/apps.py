@@ -2,4 +2,8 @@ from django.apps import AppConfig
 
 
 class BlogConfig(AppConfig):
-    name = "blog"
+    name = "blog_app.blog"
+    label = "blog"
+
+    def ready(self):
+        from . import checks, signals  # noqa
@@ -0,0 +1,121 @@
+"""
+Requests served per process under ASGI when the database is slow.
+
+Run with:
+    ./manage.py test blog_app.blog.benchmarks.bench_asgi
+
+BLOG_BENCH_DB_DELAY_MS  delay added to every SQL query (default 50)
+BLOG_BENCH_REQUESTS     requests per scenario (default 20)
+BLOG_BENCH_REPORT       path of the JSON report (default benchmark-asgi.json)
+
+The same requests are sent to `config.asgi.application` one at a time, as a
+sync worker handles them, and all at once. The run fails when the concurrent
+run does not overlap the database waits of at least two requests.
+"""
+import asyncio
+import os
+import time
+from datetime import timedelta
+
+from blog_app.blog.benchmarks.utils import write_report
+from blog_app.blog.factories import CommentFactory, PostFactory
+from blog_app.blog.models import Post
+from config.asgi import application
+from django.db.backends.signals import connection_created
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+DB_DELAY = float(os.getenv("BLOG_BENCH_DB_DELAY_MS", 50)) / 1000
+REQUESTS = int(os.getenv("BLOG_BENCH_REQUESTS", 20))
+
+
+def _delayed_execute(execute, sql, params, many, context):
+    time.sleep(DB_DELAY)
+    return execute(sql, params, many, context)
+
+
+def _delay_queries(sender, connection, **kwargs):
+    connection.execute_wrappers.append(_delayed_execute)
+
+
+async def _request(path):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("ascii"),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 0),
+        "server": ("testserver", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    return messages[0]["status"]
+
+
+@override_settings(
+    BLOG_API_CACHE={"ENABLED": False}, BLOG_SERVER_TIMING={"ENABLED": False}
+)
+class ASGIBenchmark(TransactionTestCase):
+    def setUp(self) -> None:
+        post = PostFactory(
+            publish_date=timezone.now() - timedelta(days=1),
+            status=Post.STATUS.PUBLISH,
+        )
+        CommentFactory.create_batch(5, post=post, published=True)
+        self.paths = {
+            "posts": reverse("api_v1:posts"),
+            "post": reverse("api_v1:post", args=(post.slug,)),
+            "post_comments": reverse("api_v1:post_comments", args=(post.slug,)),
+        }
+        connection_created.connect(_delay_queries)
+
+    def tearDown(self) -> None:
+        connection_created.disconnect(_delay_queries)
+
+    async def _sequential(self, path):
+        return [await _request(path) for _ in range(REQUESTS)]
+
+    async def _concurrent(self, path):
+        return await asyncio.gather(*(_request(path) for _ in range(REQUESTS)))
+
+    def _run(self, scenario, path):
+        start = time.perf_counter()
+        statuses = asyncio.run(scenario(path))
+        duration = time.perf_counter() - start
+        self.assertEqual([200] * REQUESTS, list(statuses))
+        return {
+            "seconds": round(duration, 3),
+            "requests_per_second": round(REQUESTS / duration, 1),
+        }
+
+    def test_concurrency(self):
+        report, failures = {}, []
+        for name, path in self.paths.items():
+            sequential = self._run(self._sequential, path)
+            concurrent = self._run(self._concurrent, path)
+            concurrency = round(sequential["seconds"] / concurrent["seconds"], 1)
+            report[name] = {
+                "sequential": sequential,
+                "concurrent": concurrent,
+                "concurrency": concurrency,
+            }
+            if concurrency < 2:
+                failures.append("{}: concurrency {} < 2".format(name, concurrency))
+
+        path = write_report("asgi", report)
+        print("\nReport written to {}".format(path))
+        self.assertEqual([], failures)
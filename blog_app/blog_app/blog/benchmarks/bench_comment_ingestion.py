@@ -0,0 +1,82 @@
+"""
+Sustained comment-insert throughput, synchronous vs queued ingestion.
+
+Run with:
+    ./manage.py test blog_app.blog.benchmarks.bench_comment_ingestion
+
+BLOG_BENCH_COMMENTS sets the number of submissions per mode (default 1000).
+"""
+import os
+import time
+from datetime import timedelta
+
+import factory
+from rest_framework.test import APITestCase
+
+from blog_app.blog.factories import CommentFactory, PostFactory
+from blog_app.blog.ingestion import get_comment_queue
+from blog_app.blog.models import Comment, Post
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+NUMBER_OF_COMMENTS = int(os.getenv("BLOG_BENCH_COMMENTS", 1000))
+BATCH_SIZE = 500
+
+
+@override_settings(BLOG_COMMENT_THROTTLING={"ENABLED": False})
+class CommentIngestionBenchmark(APITestCase):
+    def setUp(self) -> None:
+        self.post = PostFactory(
+            publish_date=timezone.now() - timedelta(days=1),
+            status=Post.STATUS.PUBLISH,
+        )
+        self.path = reverse("api_v1:post_comments", args=(self.post.slug,))
+        self.payloads = []
+        for _ in range(NUMBER_OF_COMMENTS):
+            comment = factory.build(dict, FACTORY_CLASS=CommentFactory)
+            self.payloads.append(
+                {key: comment[key] for key in ("name", "email", "body")}
+            )
+
+    def _submit_all(self):
+        start = time.perf_counter()
+        for payload in self.payloads:
+            self.client.post(self.path, data=payload)
+        return time.perf_counter() - start
+
+    def _report(self, label, seconds):
+        self.stdout_lines.append(
+            "{:<36} {:>10.1f} comments/s ({:.3f}s)".format(
+                label, NUMBER_OF_COMMENTS / seconds, seconds
+            )
+        )
+
+    def test_throughput(self):
+        self.stdout_lines = []
+
+        sync_seconds = self._submit_all()
+        self.assertEqual(NUMBER_OF_COMMENTS, Comment.objects.count())
+        self._report("sync, request path", sync_seconds)
+
+        Comment.objects.all().delete()
+        for queue in (
+            "blog_app.blog.ingestion.DatabaseCommentQueue",
+            "blog_app.blog.ingestion.FileCommentQueue",
+        ):
+            ingestion = {"MODE": "queued", "QUEUE": queue, "BATCH_SIZE": BATCH_SIZE}
+            with override_settings(BLOG_COMMENT_INGESTION=ingestion):
+                request_seconds = self._submit_all()
+                start = time.perf_counter()
+                comment_queue = get_comment_queue()
+                while comment_queue.drain(BATCH_SIZE):
+                    pass
+                drain_seconds = time.perf_counter() - start
+
+            self.assertEqual(NUMBER_OF_COMMENTS, Comment.objects.count())
+            Comment.objects.all().delete()
+            name = queue.rsplit(".", 1)[1]
+            self._report("{}, request path".format(name), request_seconds)
+            self._report("{}, end to end".format(name), request_seconds + drain_seconds)
+
+        print("\n" + "\n".join(self.stdout_lines))
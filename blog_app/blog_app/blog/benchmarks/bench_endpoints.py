@@ -0,0 +1,101 @@
+"""
+Latency, SQL query count and memory of the public API as the data grows.
+
+Run with:
+    ./manage.py test blog_app.blog.benchmarks.bench_endpoints
+
+BLOG_BENCH_SIZES        comma separated numbers of posts (default "100,1000")
+BLOG_BENCH_COMMENTS     comments per post (default 20)
+BLOG_BENCH_REQUESTS     requests per endpoint (default 50)
+BLOG_BENCH_LATENCY_SCALE multiplier of the latency budgets (default 1)
+BLOG_BENCH_REPORT       path of the JSON report (default benchmark-endpoints.json)
+
+The run fails when an endpoint goes over its budget.
+"""
+import os
+from io import StringIO
+
+from rest_framework.test import APITestCase
+
+from blog_app.blog.api.v1.pagination import KeysetPagination
+from blog_app.blog.benchmarks.utils import measure, write_report
+from blog_app.blog.factories import UserFactory
+from blog_app.blog.models import Post
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+
+SIZES = [int(size) for size in os.getenv("BLOG_BENCH_SIZES", "100,1000").split(",")]
+COMMENTS_PER_POST = int(os.getenv("BLOG_BENCH_COMMENTS", 20))
+REQUESTS = int(os.getenv("BLOG_BENCH_REQUESTS", 50))
+LATENCY_SCALE = float(os.getenv("BLOG_BENCH_LATENCY_SCALE", 1))
+
+# Query budgets are exact and catch N+1 regressions; latency budgets are p95
+# in milliseconds with the response cache disabled.
+BUDGETS = {
+    "posts": {"queries": 1, "p95_ms": 50},
+    "posts_deep_page": {"queries": 1, "p95_ms": 50},
+    "post": {"queries": 1, "p95_ms": 30},
+    "post_comments": {"queries": 2, "p95_ms": 50},
+}
+
+
+@override_settings(BLOG_API_CACHE={"ENABLED": False})
+class EndpointsBenchmark(APITestCase):
+    def _seed(self, size):
+        Post.objects.all().delete()
+        user = UserFactory()
+        call_command(
+            "blog_add_sample_data",
+            user.username,
+            str(size),
+            "--bulk",
+            "--comments-per-post",
+            str(COMMENTS_PER_POST),
+            "--seed",
+            str(size),
+            stdout=StringIO(),
+        )
+
+    def _endpoints(self):
+        published = Post.objects.get_published_posts().order_by(
+            *KeysetPagination.ordering
+        )
+        post = published.first()
+        deep_post = published[int(published.count() * 0.9)]
+        deep_cursor = KeysetPagination().encode_cursor(deep_post, reverse=False)
+        posts_path = reverse("api_v1:posts")
+        return {
+            "posts": (posts_path, {"page_size": 20}),
+            "posts_deep_page": (posts_path, {"page_size": 20, "cursor": deep_cursor}),
+            "post": (reverse("api_v1:post", args=(post.slug,)), {}),
+            "post_comments": (reverse("api_v1:post_comments", args=(post.slug,)), {}),
+        }
+
+    def test_endpoints(self):
+        report, failures = {}, []
+        for size in SIZES:
+            self._seed(size)
+            report[size] = {}
+            for name, (path, params) in self._endpoints().items():
+                result = measure(lambda: self.client.get(path, params), REQUESTS)
+                report[size][name] = result
+
+                budget = BUDGETS[name]
+                if result["queries"] > budget["queries"]:
+                    failures.append(
+                        "{} @ {} posts: {} queries > {}".format(
+                            name, size, result["queries"], budget["queries"]
+                        )
+                    )
+                p95_budget = budget["p95_ms"] * LATENCY_SCALE
+                if result["p95_ms"] > p95_budget:
+                    failures.append(
+                        "{} @ {} posts: p95 {}ms > {}ms".format(
+                            name, size, result["p95_ms"], p95_budget
+                        )
+                    )
+
+        path = write_report("endpoints", report)
+        print("\nReport written to {}".format(path))
+        self.assertEqual([], failures)
@@ -0,0 +1,94 @@
+"""
+Serialization cost of a list page, ModelSerializer vs `values_list()` rows.
+
+Run with:
+    ./manage.py test blog_app.blog.benchmarks.bench_serialization
+
+BLOG_BENCH_PAGE_SIZE    rows per page (default 100)
+BLOG_BENCH_REQUESTS     repetitions per variant (default 200)
+BLOG_BENCH_REPORT       path of the JSON report (default benchmark-serialization.json)
+
+Both variants fetch the page and encode it to JSON bytes. The run fails when
+the rows path is not faster than the serializer.
+"""
+import os
+from datetime import timedelta
+
+from rest_framework.renderers import JSONRenderer
+
+from blog_app.blog.api.v1.rows import dumps, get_row_serializer
+from blog_app.blog.api.v1.serializers import CommentSerializer, ListPostSerializer
+from blog_app.blog.benchmarks.utils import measure, write_report
+from blog_app.blog.factories import PostFactory
+from blog_app.blog.models import Comment, Post
+from django.test import TestCase
+from django.utils import timezone
+
+PAGE_SIZE = int(os.getenv("BLOG_BENCH_PAGE_SIZE", 100))
+REQUESTS = int(os.getenv("BLOG_BENCH_REQUESTS", 200))
+
+
+class SerializationBenchmark(TestCase):
+    def setUp(self) -> None:
+        now = timezone.now()
+        post = PostFactory(publish_date=now - timedelta(days=1))
+        Post.objects.bulk_create(
+            Post(
+                author=post.author,
+                title="Benchmark {}".format(i),
+                slug="benchmark-{}".format(i),
+                summary="Summary {}".format(i),
+                content="Content",
+                status=Post.STATUS.PUBLISH,
+                publish_date=now - timedelta(minutes=i + 1),
+            )
+            for i in range(PAGE_SIZE)
+        )
+        Comment.objects.bulk_create(
+            Comment(
+                post=post,
+                name="Name {}".format(i),
+                email="name{}@example.com".format(i),
+                body="Body {}".format(i),
+                published=True,
+                publish_date=now - timedelta(minutes=i + 1),
+            )
+            for i in range(PAGE_SIZE)
+        )
+        self.querysets = {
+            "posts": (
+                ListPostSerializer,
+                Post.objects.get_published_posts()[:PAGE_SIZE],
+            ),
+            "comments": (
+                CommentSerializer,
+                Comment.objects.get_published_comments(post.pk)[:PAGE_SIZE],
+            ),
+        }
+
+    def _serializer(self, serializer_class, queryset):
+        return JSONRenderer().render(serializer_class(queryset.all(), many=True).data)
+
+    def _rows(self, serializer_class, queryset):
+        row_serializer = get_row_serializer(serializer_class)
+        rows = queryset.values_list(*row_serializer.fields, named=True)
+        return dumps(row_serializer.to_representation(rows))
+
+    def test_serialization(self):
+        report, failures = {}, []
+        for name, (serializer_class, queryset) in self.querysets.items():
+            serializer = measure(
+                lambda: self._serializer(serializer_class, queryset), REQUESTS
+            )
+            rows = measure(lambda: self._rows(serializer_class, queryset), REQUESTS)
+            report[name] = {"serializer": serializer, "rows": rows}
+            if rows["p50_ms"] >= serializer["p50_ms"]:
+                failures.append(
+                    "{}: rows p50 {}ms >= serializer p50 {}ms".format(
+                        name, rows["p50_ms"], serializer["p50_ms"]
+                    )
+                )
+
+        path = write_report("serialization", report)
+        print("\nReport written to {}".format(path))
+        self.assertEqual([], failures)
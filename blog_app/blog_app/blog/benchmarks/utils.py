@@ -0,0 +1,54 @@
+import json
+import math
+import os
+import time
+import tracemalloc
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def percentile(samples, fraction):
+    """
+    Nearest-rank percentile of `samples`.
+    """
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def measure(callable_, repeat):
+    """
+    Call `callable_` `repeat` times and summarise latency and SQL queries,
+    then call it once more under tracemalloc to record its peak memory.
+    """
+    latencies, queries = [], []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            callable_()
+            latencies.append((time.perf_counter() - start) * 1000)
+        queries.append(len(context.captured_queries))
+
+    tracemalloc.start()
+    try:
+        callable_()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "requests": repeat,
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "queries": max(queries),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def write_report(name, results):
+    path = os.getenv("BLOG_BENCH_REPORT", "benchmark-{}.json".format(name))
+    with open(path, "w") as report:
+        json.dump(results, report, indent=2, sort_keys=True)
+    return path
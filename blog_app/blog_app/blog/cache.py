@@ -0,0 +1,106 @@
+import time
+
+from blog_app.core.db import note_write
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Post
+
+LIST_VERSION_KEY = "blog:version:list"
+POST_VERSION_KEY = "blog:version:post:{}"
+NEXT_PUBLISH_DATE_KEY = "blog:next_publish_date:{}"
+
+
+def get_cache_settings():
+    return getattr(settings, "BLOG_API_CACHE", {})
+
+
+def is_cache_enabled():
+    return get_cache_settings().get("ENABLED", True)
+
+
+def get_cache():
+    return caches[get_cache_settings().get("CACHE_ALIAS", "default")]
+
+
+def post_version_key(slug):
+    return POST_VERSION_KEY.format(slug)
+
+
+def get_versions(keys):
+    """
+    Return the current version of every key, initialising missing ones.
+
+    A fresh version is seeded from the clock rather than 1, so a version that
+    was evicted never comes back with a value old entries were stored under.
+    """
+    cache = get_cache()
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def get_next_publish_date():
+    """
+    Return `Post.objects.get_next_publish_date()`, memoised until a post is
+    written or that moment passes.
+    """
+    cache = get_cache()
+    key = NEXT_PUBLISH_DATE_KEY.format(get_versions([LIST_VERSION_KEY])[0])
+    cached = cache.get(key)
+    if cached is not None and (
+        cached["until"] is None or cached["until"] > timezone.now()
+    ):
+        return cached["until"]
+
+    until = Post.objects.get_next_publish_date()
+    cache.set(key, {"until": until}, get_cache_settings().get("TIMEOUT", 300))
+    return until
+
+
+def bump_versions(keys):
+    """
+    Invalidate the responses cached under `keys`.
+
+    Inside a transaction the versions are bumped again once it commits, as
+    other requests still read the old rows until then and may cache them
+    under the version bumped now.
+    """
+    keys = list(keys)
+    _incr_versions(keys)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _incr_versions(keys))
+
+
+def _incr_versions(keys):
+    cache = get_cache()
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+    # Fill the invalidated entries from the primary.
+    note_write()
+
+
+def bump_list_version():
+    bump_versions([LIST_VERSION_KEY])
+
+
+def bump_post_versions(slugs):
+    bump_versions([post_version_key(slug) for slug in set(slugs)])
+
+
+def bump_versions_for_posts(post_ids):
+    """
+    Invalidate cached responses of the posts with the given ids.
+    """
+    post_ids = set(post_ids)
+    if post_ids:
+        slugs = Post.objects.filter(pk__in=post_ids).values_list("slug", flat=True)
+        bump_post_versions(slugs)
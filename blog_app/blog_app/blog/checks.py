@@ -0,0 +1,29 @@
+from django.core.checks import Warning, register
+
+from .cache import get_cache_settings
+
+PER_PROCESS_BACKENDS = ("django.core.cache.backends.locmem.LocMemCache",)
+
+
+@register("caches", deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Cached responses are invalidated through versions kept in the cache, so
+    every worker process has to use the same cache.
+    """
+    from django.conf import settings
+
+    alias = get_cache_settings().get("CACHE_ALIAS", "default")
+    if settings.CACHES.get(alias, {}).get("BACKEND") not in PER_PROCESS_BACKENDS:
+        return []
+    return [
+        Warning(
+            f"The blog cache {alias!r} is local to each process.",
+            hint=(
+                "Saving a post only invalidates the responses cached by the "
+                "process that saved it. Set DJANGO_CACHE_BACKEND to a shared "
+                "backend when serving with several workers."
+            ),
+            id="blog.W001",
+        )
+    ]
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+from urllib.parse import urlsplit
+
+from django.db.models import Count, Max, Sum
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from .api.v1.pagination import KeysetPagination
+from .feeds import replace_file
+from .models import Comment, Post
+
+MANIFEST = "manifest.json"
+
+
+def get_signatures():
+    """
+    Return a signature of the post list and, for every visible post, its
+    `updated_at` and a signature of its visible comments, in two queries.
+
+    Comment edits only move the post's `comments_changed_at`, and comments
+    that became due only show in the comments themselves until
+    blog_repair_comment_stats counts them, so both are signed.
+    """
+    now = timezone.now()
+    rows = list(
+        Post.objects.get_published_posts().values_list(
+            "slug",
+            "updated_at",
+            "comment_count",
+            "last_comment_at",
+            "comments_changed_at",
+        )
+    )
+    comments = (
+        Comment.objects.filter(
+            published=True,
+            publish_date__lte=now,
+            post__status=Post.STATUS.PUBLISH,
+            post__publish_date__lte=now,
+        )
+        .order_by()
+        .values_list("post__slug")
+        .annotate(Count("id"), Sum("id"), Max("publish_date"))
+    )
+    comment_signatures = {
+        slug: "{}:{}:{}".format(count, ids, last_publish.isoformat())
+        for slug, count, ids, last_publish in comments
+    }
+    posts = {
+        slug: {
+            "updated_at": updated_at.isoformat(),
+            "comments": "{}:{}".format(
+                comment_signatures.get(slug, ""),
+                changed_at.isoformat() if changed_at else "",
+            ),
+        }
+        for slug, updated_at, _, _, changed_at in rows
+    }
+    # The list shows the comment stats, not the comments.
+    list_rows = [row[:4] for row in rows]
+    list_signature = hashlib.md5(repr(list_rows).encode("utf-8")).hexdigest()
+    return list_signature, posts
+
+
+class StaticExporter:
+    """
+    Write the responses of the public API under `output`, one file per URL.
+
+    `/api/v1/posts/` is saved as `api/v1/posts/index.json`,
+    `/api/v1/posts/<slug>/comments` as `api/v1/posts/<slug>/comments.json`,
+    and a query string is kept in the name, as in `index?page_size=20.json`,
+    so a web server can map requests to files with the path and query alone.
+    Paginated lists are followed through their `next` links.
+
+    The files are rendered by the API views, so they are what the API serves.
+    A manifest records what every file was rendered from, and a later export
+    only rewrites the files of posts whose `updated_at` or visible comments
+    changed, and the list pages if any post in them did.
+    """
+
+    def __init__(self, output, base_url="http://localhost", page_size=None):
+        self.output = os.path.normpath(output)
+        self.base_url = base_url
+        self.page_size = page_size or KeysetPagination.page_size
+        parts = urlsplit(base_url)
+        self.factory = RequestFactory(HTTP_HOST=parts.netloc)
+        self.secure = parts.scheme == "https"
+
+    def export(self, full=False):
+        """
+        Bring the files up to date and return the number of files written and
+        removed.
+        """
+        manifest = self.read_manifest()
+        options = {"base_url": self.base_url, "page_size": self.page_size}
+        if full or manifest.get("options") != options:
+            # Forget what the files were rendered from, not the files, so those
+            # that are not written again are still removed.
+            manifest = {
+                "options": options,
+                "list": {"files": manifest.get("list", {}).get("files", [])},
+                "posts": {
+                    slug: {"files": entry["files"]}
+                    for slug, entry in manifest.get("posts", {}).items()
+                },
+            }
+        self.written = self.removed = 0
+
+        list_signature, posts = get_signatures()
+        for slug in set(manifest["posts"]) - set(posts):
+            self.remove(manifest["posts"].pop(slug)["files"])
+
+        for slug, signature in posts.items():
+            entry = manifest["posts"].get(slug, {"files": []})
+            if all(entry.get(key) == value for key, value in signature.items()):
+                continue
+            files = self.write_pages(reverse("api_v1:post", args=(slug,)))
+            files += self.write_pages(reverse("api_v1:post_comments", args=(slug,)))
+            self.remove(set(entry["files"]) - set(files))
+            manifest["posts"][slug] = dict(signature, files=files)
+
+        if manifest["list"].get("signature") != list_signature:
+            path = reverse("api_v1:posts")
+            files = self.write_pages(path)
+            files += self.write_pages(path, "page_size={}".format(self.page_size))
+            self.remove(set(manifest["list"].get("files", [])) - set(files))
+            manifest["list"] = {"signature": list_signature, "files": files}
+
+        self.write_manifest(manifest)
+        return self.written, self.removed
+
+    def write_pages(self, path, query=""):
+        """
+        Save the response to `path` and the pages its `next` links lead to.
+        Return the names of the saved files.
+        """
+        files = []
+        while True:
+            response = self.render(path, query)
+            if response.status_code != 200:
+                break
+            name = self.get_file_name(path, query)
+            self.write(name, response.content)
+            files.append(name)
+            data = json.loads(response.content)
+            if not isinstance(data, dict) or not data.get("next"):
+                break
+            query = urlsplit(data["next"]).query
+        return files
+
+    def render(self, path, query=""):
+        request = self.factory.get(
+            "{}?{}".format(path, query) if query else path, secure=self.secure
+        )
+        match = resolve(path)
+        response = match.func(request, *match.args, **match.kwargs)
+        if hasattr(response, "render"):
+            response.render()
+        return response
+
+    def get_file_name(self, path, query=""):
+        name = path.lstrip("/")
+        if name.endswith("/"):
+            name += "index"
+        if query:
+            name += "?" + query
+        return name + ".json"
+
+    def write(self, name, content):
+        """
+        Replace file `name` at once, so it is never served half written.
+        """
+        replace_file(os.path.join(self.output, name), content)
+        self.written += 1
+
+    def remove(self, names):
+        for name in names:
+            path = os.path.join(self.output, name)
+            if os.path.exists(path):
+                os.remove(path)
+                self.removed += 1
+            # Drop the directories left empty, up to the output directory.
+            directory = os.path.dirname(path)
+            while directory != self.output:
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    break
+                directory = os.path.dirname(directory)
+
+    def read_manifest(self):
+        try:
+            with open(os.path.join(self.output, MANIFEST)) as manifest:
+                return json.load(manifest)
+        except FileNotFoundError:
+            return {}
+
+    def write_manifest(self, manifest):
+        content = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+        replace_file(os.path.join(self.output, MANIFEST), content)
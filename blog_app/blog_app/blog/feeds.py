@@ -0,0 +1,219 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+
+from django.conf import settings
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.xmlutils import SimplerXMLGenerator
+
+from .models import Post
+
+FEED_CLASSES = {
+    "rss.xml": Rss201rev2Feed,
+    "atom.xml": Atom1Feed,
+}
+SITEMAP = "sitemap.xml"
+DOCUMENT_NAMES = (*FEED_CLASSES, SITEMAP)
+# Limit of URLs in one sitemap file, see https://www.sitemaps.org/protocol.html
+SITEMAP_MAX_URLS = 50000
+# Fingerprint and last modification date of the documents being served
+CURRENT = "current.json"
+
+
+def get_feeds_settings():
+    return getattr(settings, "BLOG_FEEDS", {})
+
+
+def get_feeds_directory():
+    return get_feeds_settings().get("DIR", "feeds")
+
+
+def compute_fingerprint():
+    """
+    Fingerprint the posts in one aggregate query.
+
+    Any save of a post moves the newest `updated_at`, and a scheduled post
+    becoming visible changes the count and newest publish date of the visible
+    posts. Comment changes do not touch either.
+    """
+    visible = Q(status=Post.STATUS.PUBLISH, publish_date__lte=timezone.now())
+    stats = Post.objects.aggregate(
+        last_update=Max("updated_at"),
+        visible=Count("id", filter=visible),
+        last_publish=Max("publish_date", filter=visible),
+    )
+    value = "{visible}:{last_update}:{last_publish}".format(**stats)
+    fingerprint = hashlib.md5(value.encode("utf-8")).hexdigest()
+    last_modified = max(
+        (date for date in (stats["last_update"], stats["last_publish"]) if date),
+        default=None,
+    )
+    return fingerprint, last_modified
+
+
+def get_current():
+    """
+    Return the fingerprint and last modification date of the documents being
+    served, or None before the first build.
+    """
+    try:
+        with open(os.path.join(get_feeds_directory(), CURRENT)) as current_file:
+            current = json.load(current_file)
+    except FileNotFoundError:
+        return None
+    last_modified = current["last_modified"]
+    return current["fingerprint"], last_modified and parse_datetime(last_modified)
+
+
+def get_document(name):
+    """
+    Return the content of document `name` with its fingerprint and last
+    modification date, or None before the first build. Requests only read
+    documents, they are written by `build()`.
+    """
+    current = get_current()
+    if current is None:
+        return None
+    fingerprint, last_modified = current
+    with open(_path(fingerprint, name), "rb") as document:
+        return document.read(), fingerprint, last_modified
+
+
+def build(force=False):
+    """
+    Build the documents if the posts changed since the last build. Return the
+    fingerprint being served and whether it was built now.
+
+    The fingerprint is computed before the documents, so a post written while
+    they are built changes it again and the next build picks the post up. Every
+    file is written to a temporary file and renamed over its name, and the
+    documents are written before `CURRENT`, so readers always get complete
+    documents of the fingerprint they read.
+    """
+    os.makedirs(get_feeds_directory(), exist_ok=True)
+    fingerprint, last_modified = compute_fingerprint()
+    current = get_current()
+    if current is not None and current[0] == fingerprint and not force:
+        return fingerprint, False
+
+    for name, content in build_documents().items():
+        replace_file(_path(fingerprint, name), content)
+    replace_file(
+        os.path.join(get_feeds_directory(), CURRENT),
+        json.dumps(
+            {
+                "fingerprint": fingerprint,
+                "last_modified": last_modified and last_modified.isoformat(),
+            }
+        ).encode("utf-8"),
+    )
+    if current is not None and current[0] != fingerprint:
+        # Start the grace period of the replaced documents.
+        for name in DOCUMENT_NAMES:
+            try:
+                os.utime(_path(current[0], name))
+            except FileNotFoundError:
+                pass
+    prune(fingerprint)
+    return fingerprint, True
+
+
+def prune(fingerprint):
+    """
+    Remove the files of other fingerprints, and temporary files left by
+    interrupted builds, once they are BLOG_FEEDS["GRACE_SECONDS"] old. Requests
+    that read `CURRENT` just before it changed can still open the documents.
+    """
+    oldest = time.time() - get_feeds_settings().get("GRACE_SECONDS", 300)
+    for entry in os.scandir(get_feeds_directory()):
+        if entry.name == CURRENT or entry.name.startswith(fingerprint + "-"):
+            continue
+        try:
+            if entry.stat().st_mtime < oldest:
+                os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+
+def build_documents():
+    documents = {
+        name: build_feed(feed_class) for name, feed_class in FEED_CLASSES.items()
+    }
+    documents[SITEMAP] = build_sitemap()
+    return documents
+
+
+def build_feed(feed_class):
+    feeds_settings = get_feeds_settings()
+    feed = feed_class(
+        title=feeds_settings.get("TITLE", "Blog"),
+        link=feeds_settings.get("SITE_URL", ""),
+        description=feeds_settings.get("DESCRIPTION", ""),
+        language=settings.LANGUAGE_CODE,
+    )
+    posts = (
+        Post.objects.get_published_posts()
+        .select_related("author")
+        .only("title", "slug", "summary", "publish_date", "updated_at", "author")
+    )
+    for post in posts[: feeds_settings.get("ITEMS", 50)]:
+        feed.add_item(
+            title=post.title,
+            link=_post_url(post.slug),
+            description=post.summary,
+            unique_id=_post_url(post.slug),
+            author_name=post.author.get_full_name() or post.author.get_username(),
+            pubdate=post.publish_date,
+            updateddate=post.updated_at,
+        )
+    return feed.writeString("utf-8").encode("utf-8")
+
+
+def build_sitemap():
+    document = io.StringIO()
+    handler = SimplerXMLGenerator(document, "utf-8")
+    handler.startDocument()
+    handler.startElement(
+        "urlset", {"xmlns": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+    )
+    posts = Post.objects.get_published_posts().values_list("slug", "updated_at")
+    for slug, updated_at in posts[:SITEMAP_MAX_URLS].iterator():
+        handler.startElement("url", {})
+        handler.addQuickElement("loc", _post_url(slug))
+        handler.addQuickElement(
+            "lastmod", updated_at.replace(microsecond=0).isoformat()
+        )
+        handler.endElement("url")
+    handler.endElement("urlset")
+    handler.endDocument()
+    return document.getvalue().encode("utf-8")
+
+
+def _path(fingerprint, name):
+    return os.path.join(get_feeds_directory(), "{}-{}".format(fingerprint, name))
+
+
+def replace_file(path, content):
+    """
+    Write `content` to a temporary file next to `path` and rename it over
+    `path`, so readers never see it half written. Concurrent writers each use
+    their own temporary file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=".", suffix=".tmp"
+    )
+    with os.fdopen(descriptor, "wb") as output:
+        output.write(content)
+    os.chmod(temporary, 0o644)
+    os.replace(temporary, path)
+
+
+def _post_url(slug):
+    return get_feeds_settings().get("POST_URL", "/posts/{slug}/").format(slug=slug)
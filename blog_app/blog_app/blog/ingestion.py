@@ -0,0 +1,211 @@
+import fcntl
+import json
+import os
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from .cache import bump_versions_for_posts
+from .models import Comment, PendingComment, Post
+
+COMMENT_FIELDS = ("post_id", "name", "email", "body")
+
+
+def get_ingestion_settings():
+    return getattr(settings, "BLOG_COMMENT_INGESTION", {})
+
+
+def is_queued_ingestion_enabled():
+    return get_ingestion_settings().get("MODE", "sync") == "queued"
+
+
+def get_comment_queue():
+    ingestion_settings = get_ingestion_settings()
+    queue_class = import_string(
+        ingestion_settings.get("QUEUE", "blog_app.blog.ingestion.DatabaseCommentQueue")
+    )
+    return queue_class(**ingestion_settings.get("QUEUE_OPTIONS", {}))
+
+
+class BaseCommentQueue:
+    """
+    Buffer of validated comments waiting to be written with `bulk_create`.
+    """
+
+    def put(self, comment):
+        raise NotImplementedError
+
+    def drain(self, batch_size):
+        """
+        Write up to `batch_size` queued comments, return how many were written.
+        """
+        raise NotImplementedError
+
+
+def write_comments(comments):
+    created = Comment.objects.bulk_create(
+        [
+            Comment(**{field: comment[field] for field in COMMENT_FIELDS})
+            for comment in comments
+        ]
+    )
+    # bulk_create() does not send post_save.
+    bump_versions_for_posts(comment["post_id"] for comment in comments)
+    return len(created)
+
+
+class DatabaseCommentQueue(BaseCommentQueue):
+    """
+    Queue backed by the `PendingComment` table.
+
+    Workers claim rows with SKIP LOCKED, so several of them can drain
+    concurrently, and a batch is deleted in the same transaction that writes
+    the comments.
+    """
+
+    def put(self, comment):
+        PendingComment.objects.create(
+            **{field: comment[field] for field in COMMENT_FIELDS}
+        )
+
+    def drain(self, batch_size):
+        with transaction.atomic():
+            pending = list(
+                PendingComment.objects.select_for_update(skip_locked=True)
+                .order_by("id")
+                .values("id", *COMMENT_FIELDS)[:batch_size]
+            )
+            if not pending:
+                return 0
+            written = write_comments(pending)
+            PendingComment.objects.filter(
+                pk__in=[comment["id"] for comment in pending]
+            ).delete()
+        return written
+
+
+class FileCommentQueue(BaseCommentQueue):
+    """
+    Queue backed by an append-only JSON lines spool file.
+
+    A worker moves the spool aside under an exclusive lock and drains the
+    claimed file batch by batch, recording its byte offset after each one.
+    Draining holds an exclusive lock on a separate lock file, so a second
+    worker finds the queue empty instead of writing the same comments again.
+    A batch may be written twice if the worker dies between the INSERT and
+    the offset update.
+
+    Comments of posts deleted since they were queued are appended to a
+    dead letter file rather than written.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(settings.BASE_DIR, "comment_queue.jsonl")
+        self.claimed_path = self.path + ".claimed"
+        self.offset_path = self.path + ".offset"
+        self.lock_path = self.path + ".lock"
+        self.dead_letter_path = self.path + ".dead"
+
+    def put(self, comment):
+        line = json.dumps({field: comment[field] for field in COMMENT_FIELDS})
+        while True:
+            with open(self.path, "a", encoding="utf-8") as spool:
+                fcntl.flock(spool, fcntl.LOCK_EX)
+                try:
+                    # A worker may have claimed the file while we waited.
+                    if not self._is_current_spool(spool):
+                        continue
+                    spool.write(line + "\n")
+                    spool.flush()
+                    return
+                finally:
+                    fcntl.flock(spool, fcntl.LOCK_UN)
+
+    def drain(self, batch_size):
+        with open(self.lock_path, "a") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Another worker is draining.
+                return 0
+            try:
+                return self._drain(batch_size)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _drain(self, batch_size):
+        while True:
+            if not os.path.exists(self.claimed_path) and not self._claim():
+                return 0
+
+            comments, offset = self._read_batch(batch_size)
+            if not comments:
+                os.remove(self.claimed_path)
+                if os.path.exists(self.offset_path):
+                    os.remove(self.offset_path)
+                continue
+
+            with transaction.atomic():
+                comments = self._drop_orphans(comments)
+                written = write_comments(comments) if comments else 0
+            with open(self.offset_path, "w") as offset_file:
+                offset_file.write(str(offset))
+            if written:
+                return written
+
+    def _read_batch(self, batch_size):
+        comments = []
+        with open(self.claimed_path, "rb") as claimed:
+            claimed.seek(self._read_offset())
+            while len(comments) < batch_size:
+                line = claimed.readline()
+                if not line:
+                    break
+                if line.strip():
+                    comments.append(json.loads(line))
+            return comments, claimed.tell()
+
+    def _drop_orphans(self, comments):
+        """
+        Dead-letter the comments of deleted posts, which would fail the INSERT
+        of every batch they are in, and return the others.
+        """
+        post_ids = {comment["post_id"] for comment in comments}
+        existing = set(
+            Post.objects.filter(pk__in=post_ids).values_list("pk", flat=True)
+        )
+        kept, orphans = [], []
+        for comment in comments:
+            (kept if comment["post_id"] in existing else orphans).append(comment)
+        if orphans:
+            with open(self.dead_letter_path, "a", encoding="utf-8") as dead_letter:
+                for comment in orphans:
+                    dead_letter.write(json.dumps(comment) + "\n")
+        return kept
+
+    def _read_offset(self):
+        try:
+            with open(self.offset_path) as offset_file:
+                return int(offset_file.read() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def _is_current_spool(self, spool):
+        try:
+            return os.fstat(spool.fileno()).st_ino == os.stat(self.path).st_ino
+        except FileNotFoundError:
+            return False
+
+    def _claim(self):
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, "a", encoding="utf-8") as spool:
+            fcntl.flock(spool, fcntl.LOCK_EX)
+            try:
+                if os.path.getsize(self.path) == 0:
+                    return False
+                os.rename(self.path, self.claimed_path)
+            finally:
+                fcntl.flock(spool, fcntl.LOCK_UN)
+        return True
@@ -1,11 +1,22 @@
 import argparse
+import random
 from datetime import timedelta
 
+from faker import Faker
+
+from blog_app.blog.cache import bump_list_version
 from blog_app.blog.factories import PostFactory
+from blog_app.blog.models import ArchiveMonth, Comment, Post
+from blog_app.blog.rendering import render_markdown
 from django.contrib.auth.models import User
 from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 from django.db.utils import IntegrityError
 from django.utils import timezone
+from django.utils.text import slugify
+
+# Faker is slow per call, so bulk mode samples text from pools built once.
+TEXT_POOL_SIZE = 500
 
 
 class Command(BaseCommand):
@@ -16,23 +27,74 @@ class Command(BaseCommand):
         parser.add_argument(
             "quantity", type=self._check_positive, help="number of posts"
         )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="generate rows in batches and write them with bulk_create",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=self._check_positive,
+            default=1000,
+            help="number of posts written per batch in bulk mode",
+        )
+        parser.add_argument(
+            "--comments-per-post",
+            type=self._check_not_negative,
+            default=0,
+            help="number of comments added to every post in bulk mode",
+        )
+        parser.add_argument(
+            "--draft-ratio",
+            type=self._check_ratio,
+            default=0.0,
+            help="fraction of drafts and unpublished comments in bulk mode",
+        )
+        parser.add_argument(
+            "--future-ratio",
+            type=self._check_ratio,
+            default=0.0,
+            help="fraction of posts with a future publish date in bulk mode",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="seed of the generated data"
+        )
 
     def _check_positive(self, value):
         int_value = int(value)
         if int_value > 0:
             return int_value
         else:
-            raise argparse.ArgumentTypeexitError(
+            raise argparse.ArgumentTypeError(
                 "%s is an invalid positive int value" % value
             )
 
+    def _check_not_negative(self, value):
+        int_value = int(value)
+        if int_value >= 0:
+            return int_value
+        else:
+            raise argparse.ArgumentTypeError(
+                "%s is an invalid non-negative int value" % value
+            )
+
+    def _check_ratio(self, value):
+        float_value = float(value)
+        if 0 <= float_value <= 1:
+            return float_value
+        else:
+            raise argparse.ArgumentTypeError("%s is not between 0 and 1" % value)
+
     def handle(self, *args, **options):
         username, quantity = options["username"], options["quantity"]
         try:
             user = User.objects.get(username=username)
-            for i in range(quantity):
-                publish_date = timezone.now() - timedelta(days=i)
-                PostFactory.create(author=user, publish_date=publish_date)
+            if options["bulk"]:
+                self._bulk_create(user, quantity, options)
+            else:
+                for i in range(quantity):
+                    publish_date = timezone.now() - timedelta(days=i)
+                    PostFactory.create(author=user, publish_date=publish_date)
         except User.DoesNotExist:
             raise CommandError("User with username '%s' does not exist" % username)
         except IntegrityError as e:
@@ -43,3 +105,90 @@ class Command(BaseCommand):
                 "Successfully created %s articles for '%s' " % (quantity, username)
             )
         )
+
+    def _bulk_create(self, user, quantity, options):
+        seed = options["seed"]
+        rng = random.Random(seed)
+        fake = Faker()
+        fake.seed_instance(seed)
+        self.summaries = [fake.sentence() for _ in range(TEXT_POOL_SIZE)]
+        # bulk_create() skips Post.save(), so contents are rendered here, once.
+        self.contents = [
+            (text, render_markdown(text))
+            for text in (fake.text(1000) for _ in range(TEXT_POOL_SIZE))
+        ]
+        self.names = [fake.name() for _ in range(TEXT_POOL_SIZE)]
+        self.emails = [fake.email() for _ in range(TEXT_POOL_SIZE)]
+        self.bodies = [fake.text(200) for _ in range(TEXT_POOL_SIZE)]
+
+        now = timezone.now()
+        batch_size = options["batch_size"]
+        for start in range(0, quantity, batch_size):
+            numbers = range(start, min(start + batch_size, quantity))
+            posts = [
+                self._build_post(user, number, seed, now, rng, options)
+                for number in numbers
+            ]
+            with transaction.atomic():
+                posts = self._write_posts(posts)
+                comments = [
+                    self._build_comment(post, rng, options)
+                    for post in posts
+                    for _ in range(options["comments_per_post"])
+                ]
+                for offset in range(0, len(comments), batch_size):
+                    Comment.objects.bulk_create(comments[offset : offset + batch_size])
+                if comments:
+                    Post.objects.refresh_comment_stats([post.pk for post in posts])
+            self.stdout.write("Created %s of %s articles" % (numbers.stop, quantity))
+
+        # bulk_create() does not send post_save.
+        ArchiveMonth.objects.rebuild()
+        bump_list_version()
+
+    def _build_post(self, user, number, seed, now, rng, options):
+        title = "Sample %s-%s" % (seed, number)
+        if rng.random() < options["draft_ratio"]:
+            status = Post.STATUS.DRAFT
+        else:
+            status = Post.STATUS.PUBLISH
+        summary = rng.choice(self.summaries)
+        content, content_html = rng.choice(self.contents)
+        return Post(
+            author=user,
+            title=title,
+            slug=slugify(title),
+            summary=summary,
+            content=content,
+            content_html=content_html,
+            status=status,
+            publish_date=self._publish_date(now, rng, options),
+        )
+
+    def _build_comment(self, post, rng, options):
+        return Comment(
+            post_id=post.pk,
+            name=rng.choice(self.names),
+            email=rng.choice(self.emails),
+            body=rng.choice(self.bodies),
+            published=rng.random() >= options["draft_ratio"],
+            publish_date=post.publish_date + timedelta(minutes=rng.randint(1, 43200)),
+        )
+
+    def _publish_date(self, now, rng, options):
+        minutes = timedelta(minutes=rng.randint(1, 60 * 24 * 365 * 5))
+        if rng.random() < options["future_ratio"]:
+            return now + minutes
+        return now - minutes
+
+    def _write_posts(self, posts):
+        created = Post.objects.bulk_create(posts)
+        if created and created[0].pk is None:
+            # Backends that cannot return ids from a bulk INSERT.
+            ids = dict(
+                Post.objects.filter(slug__in=[post.slug for post in created])
+                .values_list("slug", "id")
+            )
+            for post in created:
+                post.pk = ids[post.slug]
+        return created
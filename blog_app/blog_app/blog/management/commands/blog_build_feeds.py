@@ -0,0 +1,40 @@
+import time
+
+from blog_app.blog.feeds import build
+from blog_app.blog.models import Post
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Build the RSS and Atom feeds and the sitemap if the posts changed."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force", action="store_true", help="build even if nothing changed"
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="keep building, and as soon as a scheduled post is due",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=10.0,
+            help="seconds between checks in --loop mode",
+        )
+
+    def handle(self, *args, **options):
+        force = options["force"]
+        while True:
+            fingerprint, built = build(force=force)
+            if built:
+                self.stdout.write(
+                    self.style.SUCCESS("Successfully built feeds %s" % fingerprint)
+                )
+            elif not options["loop"]:
+                self.stdout.write("Feeds %s are up to date" % fingerprint)
+            if not options["loop"]:
+                break
+            force = False
+            time.sleep(Post.objects.get_poll_delay(options["interval"]))
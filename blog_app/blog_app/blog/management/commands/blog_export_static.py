@@ -0,0 +1,52 @@
+import time
+
+from blog_app.blog.export import StaticExporter
+from blog_app.blog.models import Post
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the JSON of the post list, post and comment endpoints to files, "
+        "rewriting only what changed since the last export."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="directory the files are written to")
+        parser.add_argument(
+            "--base-url",
+            default="http://localhost",
+            help="scheme and host of the pagination links",
+        )
+        parser.add_argument(
+            "--page-size", type=int, help="number of posts per list page"
+        )
+        parser.add_argument("--full", action="store_true", help="rewrite every file")
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="keep exporting, and as soon as a scheduled post is due",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=60.0,
+            help="seconds between exports in --loop mode",
+        )
+
+    def handle(self, *args, **options):
+        exporter = StaticExporter(
+            options["output"], options["base_url"], options["page_size"]
+        )
+        full = options["full"]
+        while True:
+            written, removed = exporter.export(full=full)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    "Successfully exported %s files, removed %s" % (written, removed)
+                )
+            )
+            if not options["loop"]:
+                break
+            full = False
+            time.sleep(Post.objects.get_poll_delay(options["interval"]))
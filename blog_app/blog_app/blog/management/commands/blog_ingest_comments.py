@@ -0,0 +1,40 @@
+import time
+
+from blog_app.blog.ingestion import get_comment_queue, get_ingestion_settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Write queued comments to the database in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=get_ingestion_settings().get("BATCH_SIZE", 500),
+            help="number of comments written per INSERT",
+        )
+        parser.add_argument(
+            "--loop", action="store_true", help="keep polling the queue"
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="seconds to wait when the queue is empty in --loop mode",
+        )
+
+    def handle(self, *args, **options):
+        queue = get_comment_queue()
+        batch_size = options["batch_size"]
+        total = 0
+        while True:
+            written = queue.drain(batch_size)
+            total += written
+            if written:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS("Successfully wrote %s comments" % total))
@@ -0,0 +1,18 @@
+from blog_app.blog.cache import bump_list_version
+from blog_app.blog.models import ArchiveMonth
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Recount the published posts of every month of the archive."
+
+    def handle(self, *args, **options):
+        ArchiveMonth.objects.rebuild()
+        # rebuild() writes without sending post_save.
+        bump_list_version()
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Successfully rebuilt archive of %s months"
+                % ArchiveMonth.objects.count()
+            )
+        )
@@ -0,0 +1,51 @@
+from blog_app.blog.cache import bump_post_versions
+from blog_app.blog.models import Post
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = "Render the Markdown content of posts without rendered HTML."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="number of posts loaded and updated at a time",
+        )
+        parser.add_argument(
+            "--all", action="store_true", help="render every post again"
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.all()
+        if not options["all"]:
+            posts = posts.filter(content_html="").exclude(content="")
+        batch_size = options["batch_size"]
+        last_id, total = 0, 0
+        while True:
+            # Only one batch of contents is held in memory at a time.
+            batch = list(
+                posts.filter(pk__gt=last_id)
+                .order_by("pk")
+                .only("pk", "slug", "content")[:batch_size]
+            )
+            if not batch:
+                break
+            now = timezone.now()
+            for post in batch:
+                post.render_content(force=True)
+                # The representation changed, so must the validators.
+                post.updated_at = now
+            with transaction.atomic():
+                Post.objects.bulk_update(batch, ["content_html", "updated_at"])
+            # bulk_update() does not send post_save.
+            bump_post_versions(post.slug for post in batch)
+            total += len(batch)
+            last_id = batch[-1].pk
+
+        self.stdout.write(
+            self.style.SUCCESS("Successfully rendered content of %s posts" % total)
+        )
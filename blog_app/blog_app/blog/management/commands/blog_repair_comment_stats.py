@@ -0,0 +1,75 @@
+import time
+
+from blog_app.blog.cache import bump_list_version, bump_versions_for_posts
+from blog_app.blog.models import Comment, Post
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the comment count and last comment date of every post, "
+        "then optionally keep counting scheduled comments as they become due."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="number of posts updated per transaction",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="keep counting scheduled comments once they are due",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=10.0,
+            help="seconds between checks for due comments in --loop mode",
+        )
+
+    def handle(self, *args, **options):
+        since = timezone.now()
+        total = self.repair(options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS("Successfully repaired stats of %s posts" % total)
+        )
+        while options["loop"]:
+            time.sleep(options["interval"])
+            since = self.count_due_comments(since)
+
+    def repair(self, batch_size):
+        last_id, total = 0, 0
+        while True:
+            post_ids = list(
+                Post.objects.filter(pk__gt=last_id)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not post_ids:
+                break
+            with transaction.atomic():
+                total += Post.objects.refresh_comment_stats(post_ids, changed=False)
+            last_id = post_ids[-1]
+
+        # QuerySet.update() does not send post_save.
+        bump_list_version()
+        return total
+
+    def count_due_comments(self, since):
+        """
+        Refresh the stats of the posts with comments that became visible after
+        `since`, and return until when they were counted.
+        """
+        until = timezone.now()
+        post_ids = list(Comment.objects.get_posts_with_due_comments(since, until))
+        if post_ids:
+            with transaction.atomic():
+                Post.objects.refresh_comment_stats(post_ids)
+            bump_versions_for_posts(post_ids)
+            bump_list_version()
+        return until
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0003_auto_20200904_1624"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(status=1),
+                fields=["-publish_date", "-id"],
+                name="blog_post_published_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["post", "published", "-publish_date", "-id"],
+                name="blog_comment_published_idx",
+            ),
+        ),
+    ]
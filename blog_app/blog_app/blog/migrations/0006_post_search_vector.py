@@ -0,0 +1,67 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_VECTOR = """
+    setweight(to_tsvector('pg_catalog.english', coalesce({row}.title, '')), 'A')
+    || setweight(to_tsvector('pg_catalog.english', coalesce({row}.summary, '')), 'B')
+    || setweight(to_tsvector('pg_catalog.english', coalesce({row}.content, '')), 'C')
+"""
+
+CREATE_TRIGGERS = """
+CREATE FUNCTION blog_post_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := {vector};
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER blog_post_search_vector_insert
+    BEFORE INSERT ON blog_post
+    FOR EACH ROW EXECUTE PROCEDURE blog_post_search_vector_update();
+
+CREATE TRIGGER blog_post_search_vector_update
+    BEFORE UPDATE OF title, summary, content ON blog_post
+    FOR EACH ROW
+    WHEN (
+        OLD.title IS DISTINCT FROM NEW.title
+        OR OLD.summary IS DISTINCT FROM NEW.summary
+        OR OLD.content IS DISTINCT FROM NEW.content
+    )
+    EXECUTE PROCEDURE blog_post_search_vector_update();
+
+UPDATE blog_post SET search_vector = {row_vector};
+""".format(
+    vector=SEARCH_VECTOR.format(row="NEW"),
+    row_vector=SEARCH_VECTOR.format(row="blog_post"),
+)
+
+DROP_TRIGGERS = """
+DROP TRIGGER blog_post_search_vector_update ON blog_post;
+DROP TRIGGER blog_post_search_vector_insert ON blog_post;
+DROP FUNCTION blog_post_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0005_pendingcomment"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="blog_post_search_idx"
+            ),
+        ),
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+    ]
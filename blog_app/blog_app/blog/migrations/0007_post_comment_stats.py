@@ -0,0 +1,40 @@
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_comment_stats(apps, schema_editor):
+    Comment = apps.get_model("blog", "Comment")
+    Post = apps.get_model("blog", "Post")
+    published = Comment.objects.filter(post=models.OuterRef("pk"), published=True)
+    count = (
+        published.order_by()
+        .values("post")
+        .annotate(count=models.Count("id"))
+        .values("count")
+    )
+    last = published.order_by("-publish_date").values("publish_date")[:1]
+    Post.objects.update(
+        comment_count=Coalesce(models.Subquery(count), 0),
+        last_comment_at=models.Subquery(last),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0006_post_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="last_comment_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(fill_comment_stats, migrations.RunPython.noop),
+    ]
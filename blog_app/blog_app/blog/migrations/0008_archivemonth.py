@@ -0,0 +1,44 @@
+from django.db import migrations, models
+from django.db.models.functions import TruncMonth
+
+
+def fill_archive(apps, schema_editor):
+    ArchiveMonth = apps.get_model("blog", "ArchiveMonth")
+    Post = apps.get_model("blog", "Post")
+    counts = (
+        Post.objects.filter(status=1, publish_date__isnull=False)
+        .annotate(month=TruncMonth("publish_date", output_field=models.DateField()))
+        .order_by()
+        .values_list("month")
+        .annotate(models.Count("id"))
+    )
+    ArchiveMonth.objects.bulk_create(
+        ArchiveMonth(month=month, post_count=count) for month, count in counts
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0007_post_comment_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchiveMonth",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField(unique=True)),
+                ("post_count", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(fill_archive, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0008_archivemonth"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="content_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+    ]
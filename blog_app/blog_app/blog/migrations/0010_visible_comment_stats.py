@@ -0,0 +1,34 @@
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def refresh_comment_stats(apps, schema_editor):
+    # Scheduled comments were counted before they were due.
+    Comment = apps.get_model("blog", "Comment")
+    Post = apps.get_model("blog", "Post")
+    visible = Comment.objects.filter(
+        post=models.OuterRef("pk"), published=True, publish_date__lte=timezone.now()
+    )
+    count = (
+        visible.order_by()
+        .values("post")
+        .annotate(count=models.Count("id"))
+        .values("count")
+    )
+    last = visible.order_by("-publish_date").values("publish_date")[:1]
+    Post.objects.update(
+        comment_count=Coalesce(models.Subquery(count), 0),
+        last_comment_at=models.Subquery(last),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0009_post_content_html"),
+    ]
+
+    operations = [
+        migrations.RunPython(refresh_comment_stats, migrations.RunPython.noop),
+    ]
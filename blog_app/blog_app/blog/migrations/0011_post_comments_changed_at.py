@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0010_visible_comment_stats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="comments_changed_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -1,17 +1,121 @@
 import datetime
 
 from django.contrib.auth.models import User
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                            SearchVectorField)
+from django.db import models, transaction
+from django.db.models.functions import Cast, Coalesce, Greatest, TruncMonth
 from django.utils import timezone
 
 from .behaviors import Creatable, Updatable
+from .rendering import render_markdown
+
+SEARCH_CONFIG = "english"
+COMMENT_STATS_FIELDS = ("comment_count", "last_comment_at", "comments_changed_at")
+# Written by database triggers, see migration 0006.
+TRIGGER_FIELDS = ("search_vector",)
 
 
 class PostManager(models.Manager):
     def get_published_posts(self):
-        return self.filter(
-            status=Post.STATUS.PUBLISH, publish_date__lte=timezone.now()
-        ).order_by("-publish_date")
+        return (
+            self.filter(status=Post.STATUS.PUBLISH, publish_date__lte=timezone.now())
+            .defer("search_vector")
+            .order_by("-publish_date")
+        )
+
+    def search_published_posts(self, text):
+        """
+        Return published posts matching `text`, annotated with their `rank`.
+        """
+        query = SearchQuery(text, config=SEARCH_CONFIG)
+        return (
+            self.get_published_posts()
+            .filter(search_vector=query)
+            # ts_rank() is a real, which does not survive the round trip
+            # through a JSON cursor. Compare the double the cursor holds.
+            .annotate(
+                rank=Cast(
+                    SearchRank(models.F("search_vector"), query), models.FloatField()
+                )
+            )
+        )
+
+    def get_next_publish_date(self):
+        """
+        Return when the next scheduled post becomes visible, or None.
+        """
+        return (
+            self.filter(status=Post.STATUS.PUBLISH, publish_date__gt=timezone.now())
+            .order_by("publish_date")
+            .values_list("publish_date", flat=True)
+            .first()
+        )
+
+    def get_poll_delay(self, interval):
+        """
+        Return how long a worker checking every `interval` seconds should
+        wait, less if a scheduled post becomes visible sooner.
+        """
+        next_publish_date = self.get_next_publish_date()
+        if next_publish_date is None:
+            return interval
+        due = (next_publish_date - timezone.now()).total_seconds()
+        return max(0, min(interval, due))
+
+    def add_published_comments(self, post_id, number, last_publish_date):
+        """
+        Count `number` comments of the post that became visible, the newest of
+        them published at `last_publish_date`.
+        """
+        last = models.Value(last_publish_date, output_field=models.DateTimeField())
+        return self.filter(pk=post_id).update(
+            comment_count=models.F("comment_count") + number,
+            last_comment_at=Greatest(Coalesce("last_comment_at", last), last),
+            comments_changed_at=timezone.now(),
+        )
+
+    def mark_comments_changed(self, post_ids):
+        """
+        Record that visible comments of the posts were edited.
+        """
+        return self.filter(pk__in=post_ids).update(comments_changed_at=timezone.now())
+
+    def refresh_comment_stats(self, post_ids, changed=True):
+        """
+        Recompute the comment stats of the posts from their visible comments,
+        marking their comments as changed unless `changed` is false.
+
+        Comments stop being counted this way: one that became due may not have
+        been counted yet, so subtracting it could drift or go below zero.
+        """
+        count = (
+            _visible_comments()
+            .order_by()
+            .values("post")
+            .annotate(count=models.Count("id"))
+            .values("count")
+        )
+        stats = {
+            "comment_count": Coalesce(models.Subquery(count), 0),
+            "last_comment_at": _last_comment_at(),
+        }
+        if changed:
+            stats["comments_changed_at"] = timezone.now()
+        return self.filter(pk__in=post_ids).update(**stats)
+
+
+def _visible_comments():
+    return Comment.objects.filter(
+        post=models.OuterRef("pk"), published=True, publish_date__lte=timezone.now()
+    )
+
+
+def _last_comment_at():
+    return models.Subquery(
+        _visible_comments().order_by("-publish_date").values("publish_date")[:1]
+    )
 
 
 class Post(Creatable, Updatable, models.Model):
@@ -28,8 +132,23 @@ class Post(Creatable, Updatable, models.Model):
     slug = models.SlugField(max_length=100, unique=True)
     summary = models.CharField(max_length=255)
     content = models.TextField()
+    # `content` rendered to sanitized HTML by save(), or blog_render_content for
+    # rows written without it.
+    content_html = models.TextField(blank=True, default="", editable=False)
     status = models.IntegerField(choices=STATUS.choices, default=STATUS.DRAFT)
     publish_date = models.DateTimeField(null=True, blank=True)
+    # Weighted title/summary/content vector, maintained by a database trigger
+    # (see migration 0006) only when one of those columns changes.
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Stats of visible comments; scheduled ones are counted once they are due
+    # by blog_repair_comment_stats --loop. They are kept up to date with
+    # UPDATEs in the transaction that changes a comment (see
+    # blog_app.blog.signals) and can be recomputed with
+    # blog_repair_comment_stats.
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    last_comment_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # Moves whenever the visible comments change, edits included.
+    comments_changed_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     @property
     def is_published(self):
@@ -38,15 +157,233 @@ class Post(Creatable, Updatable, models.Model):
         )
 
     def get_published_comments(self):
-        return self.comments.filter(
-            published=True, publish_date__lte=timezone.now()
-        ).order_by("-publish_date")
+        return Comment.objects.get_published_comments(self.pk)
+
+    def get_archive_month(self):
+        return get_archive_month(self.status, self.publish_date)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Strings are immutable, so this is a reference, not a copy.
+        instance._loaded_content = instance.__dict__.get("content")
+        return instance
+
+    def render_content(self, force=False):
+        """
+        Render `content` to `content_html` if it changed since it was loaded,
+        or always with `force`. Return whether it was rendered.
+        """
+        if "content" in self.get_deferred_fields():
+            return False
+        loaded_content = getattr(self, "_loaded_content", None)
+        if not (force or self._state.adding or self.content != loaded_content):
+            return False
+        self.content_html = render_markdown(self.content)
+        self._loaded_content = self.content
+        return True
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "content" in update_fields:
+            if self.render_content() and update_fields is not None:
+                kwargs["update_fields"] = set(update_fields) | {"content_html"}
+        # Do not overwrite comment stats updated since the post was loaded, nor
+        # the search vector, which the instance may hold stale or not at all.
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            skipped = self.get_deferred_fields().union(
+                COMMENT_STATS_FIELDS, TRIGGER_FIELDS
+            )
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in skipped
+            ]
+        # The archive is updated by signals in the same transaction.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
+
+    class Meta:
+        indexes = [
+            # Serves get_published_posts() and keyset pagination over it.
+            models.Index(
+                fields=["-publish_date", "-id"],
+                name="blog_post_published_idx",
+                condition=models.Q(status=1),  # STATUS.PUBLISH
+            ),
+            GinIndex(fields=["search_vector"], name="blog_post_search_idx"),
+        ]
 
     def __str__(self):
         return self.title
 
 
+def get_archive_month(status, publish_date):
+    """
+    Return the first day of the month a post is archived under, or None if it
+    is not published.
+    """
+    if status != Post.STATUS.PUBLISH or publish_date is None:
+        return None
+    return timezone.localtime(publish_date).date().replace(day=1)
+
+
+def get_month_range(month):
+    """
+    Return the aware datetimes the month starting on date `month` begins and
+    ends at.
+    """
+    next_month = (month + datetime.timedelta(days=31)).replace(day=1)
+    return tuple(
+        timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+        for day in (month, next_month)
+    )
+
+
+class ArchiveMonthManager(models.Manager):
+    def add_posts(self, month, number):
+        """
+        Add `number` posts, which may be negative, to the count of `month`.
+        """
+        count = models.F("post_count") + number
+        if not self.filter(month=month).update(post_count=count):
+            _, created = self.get_or_create(
+                month=month, defaults={"post_count": number}
+            )
+            if not created:
+                self.filter(month=month).update(post_count=count)
+
+    def rebuild(self):
+        """
+        Recount the published posts of every month.
+        """
+        counts = (
+            Post.objects.filter(status=Post.STATUS.PUBLISH, publish_date__isnull=False)
+            .annotate(month=TruncMonth("publish_date", output_field=models.DateField()))
+            .order_by()
+            .values_list("month")
+            .annotate(models.Count("id"))
+        )
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(
+                ArchiveMonth(month=month, post_count=count) for month, count in counts
+            )
+
+    def get_visible_months(self):
+        """
+        Return the months with visible posts, newest first.
+
+        Scheduled posts are counted as soon as they are published, so the
+        current month is counted from the posts and later months are left out.
+        """
+        current = timezone.localtime().date().replace(day=1)
+        months = list(
+            self.filter(month__lt=current, post_count__gt=0).order_by("-month")
+        )
+        start, _ = get_month_range(current)
+        count = (
+            Post.objects.get_published_posts().filter(publish_date__gte=start).count()
+        )
+        if count:
+            months.insert(0, ArchiveMonth(month=current, post_count=count))
+        return months
+
+
+class ArchiveMonth(models.Model):
+    """
+    Number of published posts per month of their publish date, scheduled ones
+    included. Kept up to date by signals when a post is saved or deleted.
+    """
+
+    objects = ArchiveMonthManager()
+
+    month = models.DateField(unique=True)
+    post_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return "{:%Y-%m}: {}".format(self.month, self.post_count)
+
+
+class CommentManager(models.Manager):
+    def get_published_comments(self, post_id):
+        return self.filter(
+            post_id=post_id, published=True, publish_date__lte=timezone.now()
+        ).order_by("-publish_date")
+
+    def get_next_publish_date(self, post_id):
+        """
+        Return when the next scheduled comment of the post becomes visible,
+        or None.
+        """
+        return (
+            self.filter(
+                post_id=post_id, published=True, publish_date__gt=timezone.now()
+            )
+            .order_by("publish_date")
+            .values_list("publish_date", flat=True)
+            .first()
+        )
+
+    def get_posts_with_due_comments(self, since, until):
+        """
+        Return the ids of the posts with published comments scheduled after
+        `since` that are visible at `until`.
+        """
+        due = self.filter(
+            post=models.OuterRef("pk"),
+            published=True,
+            publish_date__gt=since,
+            publish_date__lte=until,
+        )
+        # One probe of blog_comment_published_idx per post.
+        return (
+            Post.objects.filter(models.Exists(due))
+            .order_by()
+            .values_list("pk", flat=True)
+        )
+
+    def set_published(self, comments, published):
+        """
+        Publish or unpublish `comments` with one UPDATE and keep the comment
+        stats of their posts. Return the ids of the posts whose comments changed.
+        """
+        with transaction.atomic():
+            ids = list(
+                comments.filter(published=not published)
+                .select_for_update()
+                .values_list("id", flat=True)
+            )
+            changed = self.filter(pk__in=ids)
+            post_ids = list(
+                changed.order_by().values_list("post_id", flat=True).distinct()
+            )
+            # Scheduled comments are counted once they are due.
+            stats = list(
+                changed.filter(publish_date__lte=timezone.now())
+                .order_by()
+                .values("post_id")
+                .annotate(number=models.Count("id"), last=models.Max("publish_date"))
+            )
+            changed.update(published=published)
+            if published:
+                for row in stats:
+                    Post.objects.add_published_comments(
+                        row["post_id"], row["number"], row["last"]
+                    )
+            else:
+                # Due comments may not be counted yet, see refresh_comment_stats.
+                Post.objects.refresh_comment_stats([row["post_id"] for row in stats])
+        return post_ids
+
+
 class Comment(Creatable, models.Model):
+    objects = CommentManager()
+
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="comments")
     name = models.CharField(max_length=80)
     email = models.EmailField()
@@ -58,8 +395,41 @@ class Comment(Creatable, models.Model):
     def is_published(self):
         return self.published and self.publish_date <= timezone.now()
 
+    def save(self, *args, **kwargs):
+        # The post's comment stats are updated by signals in the same transaction.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
+
     class Meta:
         ordering = ["-publish_date"]
+        indexes = [
+            # Serves Post.get_published_comments() and
+            # Comment.get_posts_with_due_comments().
+            models.Index(
+                fields=["post", "published", "-publish_date", "-id"],
+                name="blog_comment_published_idx",
+            ),
+        ]
 
     def __str__(self):
         return "Comment {} by {}".format(self.body, self.name)
+
+
+class PendingComment(Creatable, models.Model):
+    """
+    Comment accepted by the API and waiting for `blog_ingest_comments`.
+    """
+
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name="pending_comments"
+    )
+    name = models.CharField(max_length=80)
+    email = models.EmailField()
+    body = models.TextField()
+
+    def __str__(self):
+        return "Pending comment {} by {}".format(self.body, self.name)
@@ -0,0 +1,110 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from .cache import get_cache
+
+SHARED_KEY = "blog:hidden:{}"
+
+
+def get_negative_cache_settings():
+    return getattr(settings, "BLOG_NEGATIVE_CACHE", {})
+
+
+class NegativeCache:
+    """
+    In-process LRU of slugs without a visible post.
+
+    A slug is remembered for BLOG_NEGATIVE_CACHE["TIMEOUT"] seconds, and never
+    past the moment a post may become visible. Saving or deleting a post
+    evicts its slugs (see `blog_app.blog.signals`), in this process and, with
+    BLOG_NEGATIVE_CACHE["SHARED"], in the blog cache, which other processes
+    check when they do not know a slug. Other processes may still answer 404
+    from their own LRU until the entry times out, so TIMEOUT should be short.
+
+    `hits` counts the lookups answered from the cache, `misses` the others.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def is_hidden(self, slug):
+        options = get_negative_cache_settings()
+        if not options.get("ENABLED", False):
+            return False
+        now = time.time()
+        with self._lock:
+            expires = self._entries.get(slug)
+            if expires is not None and expires <= now:
+                del self._entries[slug]
+                expires = None
+            if expires is not None:
+                self._entries.move_to_end(slug)
+        if expires is None and options.get("SHARED", False):
+            expires = get_cache().get(SHARED_KEY.format(slug))
+            if expires is not None and expires > now:
+                self._store(slug, expires, options)
+            else:
+                expires = None
+
+        with self._lock:
+            if expires is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return expires is not None
+
+    def add(self, slug, until=None):
+        """
+        Remember that `slug` has no visible post, at most until `until`.
+        """
+        options = get_negative_cache_settings()
+        if not options.get("ENABLED", False):
+            return
+        now = time.time()
+        expires = now + options.get("TIMEOUT", 60)
+        if until is not None:
+            expires = min(expires, until.timestamp())
+        if expires <= now:
+            return
+        self._store(slug, expires, options)
+        if options.get("SHARED", False):
+            timeout = math.ceil(expires - now)
+            get_cache().set(SHARED_KEY.format(slug), expires, timeout)
+
+    def evict(self, slugs):
+        slugs = set(slugs)
+        with self._lock:
+            for slug in slugs:
+                self._entries.pop(slug, None)
+        if get_negative_cache_settings().get("SHARED", False):
+            get_cache().delete_many([SHARED_KEY.format(slug) for slug in slugs])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+            }
+
+    def _store(self, slug, expires, options):
+        with self._lock:
+            self._entries[slug] = expires
+            self._entries.move_to_end(slug)
+            while len(self._entries) > options.get("MAX_SIZE", 10000):
+                self._entries.popitem(last=False)
+
+
+hidden_slugs = NegativeCache()
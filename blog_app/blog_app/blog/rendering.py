@@ -0,0 +1,40 @@
+import bleach
+import markdown
+
+MARKDOWN_EXTENSIONS = ["fenced_code", "tables", "sane_lists"]
+ALLOWED_TAGS = bleach.sanitizer.ALLOWED_TAGS + [
+    "br",
+    "del",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "hr",
+    "img",
+    "p",
+    "pre",
+    "table",
+    "tbody",
+    "td",
+    "th",
+    "thead",
+    "tr",
+]
+ALLOWED_ATTRIBUTES = dict(
+    bleach.sanitizer.ALLOWED_ATTRIBUTES,
+    img=["src", "alt", "title"],
+    td=["align"],
+    th=["align"],
+)
+
+
+def render_markdown(text):
+    """
+    Render Markdown `text` to HTML. Tags and attributes that are not allowed,
+    such as scripts, styles and event handlers, are escaped or dropped, and
+    so are links with other schemes than http, https and mailto.
+    """
+    html = markdown.markdown(text, extensions=MARKDOWN_EXTENSIONS)
+    return bleach.clean(html, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES)
@@ -0,0 +1,110 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import bump_list_version, bump_post_versions, bump_versions_for_posts
+from .models import ArchiveMonth, Comment, Post, get_archive_month
+from .negative_cache import hidden_slugs
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_slug(sender, instance, **kwargs):
+    instance._previous_slug = None
+    instance._previous_archive_month = None
+    if instance.pk is None:
+        return
+    previous = (
+        Post.objects.filter(pk=instance.pk)
+        .values_list("slug", "status", "publish_date")
+        .first()
+    )
+    if previous is not None:
+        slug, status, publish_date = previous
+        instance._previous_slug = slug
+        instance._previous_archive_month = get_archive_month(status, publish_date)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post(sender, instance, **kwargs):
+    slugs = [instance.slug]
+    previous_slug = getattr(instance, "_previous_slug", None)
+    if previous_slug:
+        slugs.append(previous_slug)
+    bump_post_versions(slugs)
+    bump_list_version()
+    hidden_slugs.evict(slugs)
+    # Requests reading the old row until the commit may hide the slug again.
+    transaction.on_commit(lambda: hidden_slugs.evict(slugs))
+
+
+@receiver(post_save, sender=Post)
+def update_archive(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_archive_month", None)
+    current = instance.get_archive_month()
+    if previous == current:
+        return
+    if previous is not None:
+        ArchiveMonth.objects.add_posts(previous, -1)
+    if current is not None:
+        ArchiveMonth.objects.add_posts(current, 1)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_archive(sender, instance, **kwargs):
+    month = instance.get_archive_month()
+    if month is not None:
+        ArchiveMonth.objects.add_posts(month, -1)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment(sender, instance, **kwargs):
+    bump_versions_for_posts([instance.post_id])
+
+
+@receiver(pre_save, sender=Comment)
+def remember_previous_publication(sender, instance, **kwargs):
+    if instance.pk is None:
+        instance._previous_publication = None
+    else:
+        instance._previous_publication = (
+            Comment.objects.filter(pk=instance.pk)
+            .values_list("post_id", "published", "publish_date")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Comment)
+def update_comment_stats(sender, instance, **kwargs):
+    # Only visible comments are counted, scheduled ones once they are due.
+    previous = getattr(instance, "_previous_publication", None)
+    current = (instance.post_id, instance.published, instance.publish_date)
+    if previous == current:
+        if instance.is_published:
+            Post.objects.mark_comments_changed([instance.post_id])
+        return
+    was_visible = previous is not None and _is_visible(*previous[1:])
+    if not (was_visible or instance.is_published):
+        return
+    if was_visible:
+        # A comment that became due is only counted by blog_repair_comment_stats,
+        # so recount rather than subtract one that may never have been added.
+        Post.objects.refresh_comment_stats({previous[0], instance.post_id})
+        if previous[0] != instance.post_id:
+            bump_versions_for_posts([previous[0]])
+    else:
+        Post.objects.add_published_comments(instance.post_id, 1, instance.publish_date)
+    bump_list_version()
+
+
+@receiver(post_delete, sender=Comment)
+def remove_comment_from_stats(sender, instance, **kwargs):
+    if instance.is_published:
+        Post.objects.refresh_comment_stats([instance.post_id])
+        bump_list_version()
+
+
+def _is_visible(published, publish_date):
+    return published and publish_date <= timezone.now()
@@ -1,11 +1,22 @@
+import base64
+import json
 from datetime import timedelta
+from unittest import mock
 
 import factory
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from blog_app.blog.api.v1.pagination import (CappedLimitOffsetPagination,
+                                             CommentCursorPagination,
+                                             KeysetPagination)
+from blog_app.blog.api.v1.views import PostBatch
+from blog_app.blog.cache import get_cache, get_next_publish_date
 from blog_app.blog.factories import CommentFactory, PostFactory
 from blog_app.blog.models import Post
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
@@ -85,7 +96,14 @@ class PostListTests(PostMixin, APITestCase):
         )
 
     def _compare_post_list_data(self, expected_data, received_data):
-        expected_fields = {"slug", "title", "summary", "publish_date"}
+        expected_fields = {
+            "slug",
+            "title",
+            "summary",
+            "publish_date",
+            "comment_count",
+            "last_comment_at",
+        }
         for expected, received in zip(expected_data, received_data):
             self.assertSetEqual(expected_fields, set(received.keys()))
             self.assertEqual(expected.slug, received["slug"])
@@ -95,7 +113,7 @@ class PostListTests(PostMixin, APITestCase):
 
     def test_get_only_published_posts(self):
         response = self.client.get(reverse("api_v1:posts"))
-        json = response.json()
+        json = response.json()["results"]
 
         self.assertEqual(len(self.published_posts), len(json))
 
@@ -110,7 +128,8 @@ class PostListTests(PostMixin, APITestCase):
         self._change_post_status_to_draft(self.published_posts)
         response = self.client.get(reverse("api_v1:posts"))
         json = response.json()
-        self.assertEqual(0, len(json))
+        self.assertEqual([], json["results"])
+        self.assertIsNone(json["next"])
 
     def _get_full_path(self, path, parameters=None):
         if parameters:
@@ -180,6 +199,110 @@ class PostListTests(PostMixin, APITestCase):
         )
 
 
+class PostCursorPaginationTests(PostMixin, APITestCase):
+    def setUp(self) -> None:
+        self.number_of_published_posts = 13
+        self.published_posts = self._create_posts_with_past_publish_date_and_status_published(
+            self.number_of_published_posts
+        )
+        self._create_unpublished_posts()
+
+    def _walk_pages(self, parameters):
+        pages = []
+        response = self.client.get(reverse("api_v1:posts"), parameters)
+        pages.append(response.json())
+        while pages[-1]["next"]:
+            response = self.client.get(pages[-1]["next"])
+            pages.append(response.json())
+        return pages
+
+    def test_get_first_page_without_count(self):
+        parameters = {"page_size": 5}
+        response = self.client.get(reverse("api_v1:posts"), parameters)
+        json = response.json()
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertSetEqual({"next", "previous", "results"}, set(json.keys()))
+        self.assertIsNone(json["previous"])
+        self.assertIsNotNone(json["next"])
+        self.assertEqual(
+            [post.slug for post in self.published_posts[:5]],
+            [post["slug"] for post in json["results"]],
+        )
+
+    def test_walk_all_pages_forward(self):
+        pages = self._walk_pages({"page_size": 5})
+        slugs = [post["slug"] for page in pages for post in page["results"]]
+
+        self.assertEqual(3, len(pages))
+        self.assertEqual([post.slug for post in self.published_posts], slugs)
+        self.assertIsNone(pages[-1]["next"])
+
+    def test_walk_back_with_previous_link(self):
+        pages = self._walk_pages({"page_size": 5})
+        response = self.client.get(pages[-1]["previous"])
+        json = response.json()
+
+        self.assertEqual(pages[1]["results"], json["results"])
+        response = self.client.get(json["previous"])
+        json = response.json()
+        self.assertEqual(pages[0]["results"], json["results"])
+        self.assertIsNone(json["previous"])
+
+    def test_posts_with_same_publish_date_are_not_skipped(self):
+        publish_date = self.published_posts[0].publish_date
+        Post.objects.filter(pk__in=[p.pk for p in self.published_posts]).update(
+            publish_date=publish_date
+        )
+        pages = self._walk_pages({"page_size": 4})
+        slugs = [post["slug"] for page in pages for post in page["results"]]
+
+        self.assertEqual(self.number_of_published_posts, len(set(slugs)))
+
+    def test_page_size_is_capped(self):
+        self._create_posts_with_past_publish_date_and_status_published(150)
+        response = self.client.get(reverse("api_v1:posts"), {"page_size": 1000})
+        self.assertEqual(
+            KeysetPagination.max_page_size, len(response.json()["results"])
+        )
+
+    def test_list_is_cursor_paginated_by_default(self):
+        self._create_posts_with_past_publish_date_and_status_published(10)
+        json = self.client.get(reverse("api_v1:posts")).json()
+
+        self.assertEqual(KeysetPagination.page_size, len(json["results"]))
+        self.assertIn("cursor=", json["next"])
+
+    def test_limit_is_capped(self):
+        self._create_posts_with_past_publish_date_and_status_published(150)
+        response = self.client.get(reverse("api_v1:posts"), {"limit": 1000})
+        self.assertEqual(
+            CappedLimitOffsetPagination.max_limit, len(response.json()["results"])
+        )
+
+    def test_404_when_cursor_is_invalid(self):
+        response = self.client.get(reverse("api_v1:posts"), {"cursor": "invalid"})
+        self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+    def test_404_when_cursor_values_have_wrong_types(self):
+        now = timezone.now().isoformat()
+        for position in ([1, 1], [now, now], [now, True], [now, 1.5], [now]):
+            with self.subTest(position=position):
+                payload = json.dumps({"p": position, "r": 0}).encode("utf-8")
+                cursor = base64.urlsafe_b64encode(payload).decode("ascii")
+                response = self.client.get(reverse("api_v1:posts"), {"cursor": cursor})
+                self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+    def test_constant_query_cost_at_any_depth(self):
+        self._create_posts_with_past_publish_date_and_status_published(40)
+        response = self.client.get(reverse("api_v1:posts"), {"page_size": 5})
+        next_link = response.json()["next"]
+        while next_link:
+            with self.assertNumQueries(1):
+                response = self.client.get(next_link)
+            next_link = response.json()["next"]
+
+
 class PostTest(PostMixin, APITestCase):
     def setUp(self) -> None:
         self.number_of_published_posts = 3
@@ -217,7 +340,186 @@ class PostTest(PostMixin, APITestCase):
         self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
         self.assertEqual(expected_json, json)
 
+    @override_settings(BLOG_API_CACHE={"ENABLED": False})
+    def test_304_when_etag_matches(self):
+        post = self.published_posts[0]
+        path = reverse("api_v1:post", args=(post.slug,))
+        etag = self.client.get(path)["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+        self.assertEqual(b"", response.content)
+
+    def test_304_when_not_modified_since(self):
+        post = self.published_posts[0]
+        path = reverse("api_v1:post", args=(post.slug,))
+        last_modified = self.client.get(path)["Last-Modified"]
+
+        response = self.client.get(path, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+
+    def test_200_when_post_changed_after_etag(self):
+        post = self.published_posts[0]
+        path = reverse("api_v1:post", args=(post.slug,))
+        etag = self.client.get(path)["ETag"]
+        post.summary = "Changed summary"
+        post.save()
+
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual("Changed summary", response.json()["summary"])
+        self.assertNotEqual(etag, response["ETag"])
+
+    @override_settings(BLOG_API_CACHE={"ENABLED": False})
+    def test_get_post_in_one_query_with_serialized_columns_only(self):
+        post = self.published_posts[0]
+        path = reverse("api_v1:post", args=(post.slug,))
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(path)
+
+        self.assertEqual(1, len(context.captured_queries))
+        sql = context.captured_queries[0]["sql"]
+        self.assertIn('"blog_post"."content"', sql)
+        self.assertNotIn('"blog_post"."author_id"', sql)
+
+    def test_404_for_unpublished_post_in_one_query(self):
+        # The next publish date capping negative cache entries is memoised.
+        get_next_publish_date()
+        for post in self.unpublished_posts:
+            path = reverse("api_v1:post", args=(post.slug,))
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(path)
+            self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+            self.assertEqual(1, len(context.captured_queries))
+            # Visibility is checked by the query, unpublished rows are not read.
+            self.assertIn(
+                '"blog_post"."publish_date" <=', context.captured_queries[0]["sql"]
+            )
+
+    def test_404_when_conditional_request_for_unpublished_post(self):
+        for post in self.unpublished_posts:
+            path = reverse("api_v1:post", args=(post.slug,))
+            response = self.client.get(path, HTTP_IF_NONE_MATCH='"etag"')
+            self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+
+class PostBatchTest(PostMixin, APITestCase):
+    def setUp(self) -> None:
+        get_cache().clear()
+        self.published_posts = self._create_posts_with_past_publish_date_and_status_published(
+            3
+        )
+        self.unpublished_posts = self._create_unpublished_posts()
+        self.path = reverse("api_v1:post_batch")
+
+    def _get(self, slugs):
+        return self.client.get(self.path, {"slugs": ",".join(slugs)})
+
+    def test_posts_are_returned_by_slug_in_requested_order(self):
+        posts = [self.published_posts[2], self.published_posts[0]]
+        response = self._get([post.slug for post in posts])
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        results = response.json()["results"]
+        self.assertEqual([post.slug for post in posts], list(results))
+        for post in posts:
+            single = self.client.get(reverse("api_v1:post", args=(post.slug,)))
+            self.assertEqual(single.json(), results[post.slug])
+        self.assertEqual([], response.json()["missing"])
+
+    def test_missing_and_unpublished_slugs_are_reported(self):
+        slugs = [self.published_posts[0].slug, "missing"]
+        slugs += [post.slug for post in self.unpublished_posts]
+        response = self._get(slugs)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual([slugs[0]], list(response.json()["results"]))
+        self.assertEqual(slugs[1:], response.json()["missing"])
+
+    @override_settings(BLOG_API_CACHE={"ENABLED": False})
+    def test_batch_is_one_query(self):
+        with self.assertNumQueries(1):
+            self._get([post.slug for post in self.published_posts])
+
+    def test_repeated_slugs_are_returned_once(self):
+        slug = self.published_posts[0].slug
+        response = self._get([slug, slug, ""])
+        self.assertEqual([slug], list(response.json()["results"]))
+
+    def test_400_without_slugs_or_too_many_slugs(self):
+        too_many = ["slug-{}".format(i) for i in range(PostBatch.max_slugs + 1)]
+        for slugs in ([], too_many):
+            response = self._get(slugs)
+            self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+            self.assertIn("slugs", response.json())
 
+    def test_changed_post_is_not_served_from_cache(self):
+        post = self.published_posts[0]
+        self._get([post.slug])
+        post.title = "Changed title"
+        post.save()
+
+        results = self._get([post.slug]).json()["results"]
+        self.assertEqual("Changed title", results[post.slug]["title"])
+
+
+class PostSparseFieldsTest(PostMixin, APITestCase):
+    def setUp(self) -> None:
+        get_cache().clear()
+        self.posts = self._create_posts_with_past_publish_date_and_status_published(2)
+        self.post = self.posts[0]
+
+    def _get_sql(self, path, data):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(path, data)
+        return response, context.captured_queries[-1]["sql"]
+
+    @override_settings(BLOG_API_CACHE={"ENABLED": False})
+    def test_detail_fields(self):
+        path = reverse("api_v1:post", args=(self.post.slug,))
+        response, sql = self._get_sql(path, {"fields": "title,publish_date"})
+
+        self.assertEqual(["title", "publish_date"], list(response.json()))
+        self.assertNotIn('"blog_post"."content"', sql)
+
+    @override_settings(BLOG_API_CACHE={"ENABLED": False})
+    def test_list_fields(self):
+        path = reverse("api_v1:posts")
+        for data in ({"fields": "title,slug"}, {"fields": "slug", "page_size": 1}):
+            with self.subTest(data=data):
+                response, sql = self._get_sql(path, data)
+                posts = response.json()["results"]
+                self.assertEqual(data["fields"].split(","), list(posts[0]))
+                self.assertNotIn('"blog_post"."summary"', sql)
+
+    @override_settings(BLOG_API_CACHE={"ENABLED": False})
+    def test_browsable_list_loads_requested_fields_only(self):
+        path = reverse("api_v1:posts")
+        response, sql = self._get_sql(path, {"fields": "slug", "format": "api"})
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertNotIn('"blog_post"."content"', sql)
+
+    def test_field_sets_are_cached_apart(self):
+        path = reverse("api_v1:post", args=(self.post.slug,))
+        full = self.client.get(path)
+        sparse = self.client.get(path, {"fields": "title"})
+
+        self.assertIn("content", full.json())
+        self.assertEqual({"title": self.post.title}, sparse.json())
+        self.assertNotEqual(full["ETag"], sparse["ETag"])
+
+    def test_400_for_unknown_or_empty_fields(self):
+        path = reverse("api_v1:post", args=(self.post.slug,))
+        for value in ("title,author", ","):
+            with self.subTest(fields=value):
+                response = self.client.get(path, {"fields": value})
+                self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+                self.assertIn("fields", response.json())
+
+
+@override_settings(BLOG_COMMENT_THROTTLING={"ENABLED": False})
 class CommentsListTest(PostMixin, APITestCase):
     def _create_comments_with_past_publish_date(
         self, post, published, number_of_comments
@@ -296,14 +598,14 @@ class CommentsListTest(PostMixin, APITestCase):
         json = response.json()
 
         self.assertEqual(status.HTTP_200_OK, response.status_code)
-        self._compare_comments(self.post_1_published_comments, json)
+        self._compare_comments(self.post_1_published_comments, json["results"])
 
     def test_get_empty_list_when_post_has_no_comments(self):
         for post in self.posts[1:2]:
             path = reverse("api_v1:post_comments", args=(post.slug,))
             response = self.client.get(path)
             json = response.json()
-            self.assertEqual(0, len(json))
+            self.assertEqual(0, len(json["results"]))
             self.assertEqual(status.HTTP_200_OK, response.status_code)
 
     def test_404_when_request_not_existing_post(self):
@@ -358,7 +660,7 @@ class CommentsListTest(PostMixin, APITestCase):
         json = response.json()
 
         self.assertEqual(status.HTTP_200_OK, response.status_code)
-        self._compare_comments(self.post_3_published_comments, json)
+        self._compare_comments(self.post_3_published_comments, json["results"])
 
     def test_404_when_add_comment_to_unpublished_posts(self):
         comment_data = self._get_comment_data()
@@ -384,3 +686,119 @@ class CommentsListTest(PostMixin, APITestCase):
         path = reverse("api_v1:post_comments", args=(self.post_3.slug,))
         response = self.client.post(path, data=comment_data)
         self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+
+    @override_settings(BLOG_API_CACHE={"ENABLED": False})
+    def test_304_when_comments_etag_matches(self):
+        path = reverse("api_v1:post_comments", args=(self.post_1.slug,))
+        etag = self.client.get(path)["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+
+    def test_304_when_post_without_comments_etag_matches(self):
+        path = reverse("api_v1:post_comments", args=(self.post_2.slug,))
+        response = self.client.get(path)
+        self.assertNotIn("Last-Modified", response)
+
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+
+    def test_200_when_comment_published_after_etag(self):
+        path = reverse("api_v1:post_comments", args=(self.post_2.slug,))
+        etag = self.client.get(path)["ETag"]
+        self._create_comments_with_past_publish_date(self.post_2, True, 1)
+
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual(1, len(response.json()["results"]))
+
+    @override_settings(BLOG_API_CACHE={"ENABLED": False})
+    def test_validators_are_read_from_post_row(self):
+        path = reverse("api_v1:post_comments", args=(self.post_1.slug,))
+        etag = self.client.get(path)["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(1, len(queries))
+        self.assertIn('"blog_post"."comments_changed_at"', queries[0]["sql"])
+
+        with self.assertNumQueries(2):
+            response = self.client.get(path)
+        self.assertNotIn("Last-Modified", response)
+
+    def test_200_when_comment_edited_after_etag(self):
+        path = reverse("api_v1:post_comments", args=(self.post_1.slug,))
+        etag = self.client.get(path)["ETag"]
+        comment = self.post_1_published_comments[0]
+        comment.body = "Edited body"
+        comment.save()
+
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual("Edited body", response.json()["results"][0]["body"])
+
+    @override_settings(BLOG_API_CACHE={"ENABLED": False})
+    def test_200_when_scheduled_comment_becomes_visible(self):
+        path = reverse("api_v1:post_comments", args=(self.post_2.slug,))
+        etag = self.client.get(path)["ETag"]
+
+        later = timezone.now() + timedelta(days=2)
+        with mock.patch("django.utils.timezone.now", return_value=later):
+            response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual(1, len(response.json()["results"]))
+
+    def test_comments_are_paginated_with_cursor(self):
+        path = reverse("api_v1:post_comments", args=(self.post_1.slug,))
+        response = self.client.get(path, {"page_size": 2})
+        json = response.json()
+
+        self.assertSetEqual({"next", "previous", "results"}, set(json.keys()))
+        self._compare_comments(self.post_1_published_comments[:2], json["results"])
+        self.assertIsNone(json["previous"])
+
+        json = self.client.get(json["next"]).json()
+        self._compare_comments(self.post_1_published_comments[2:], json["results"])
+        self.assertIsNone(json["next"])
+
+    def test_comments_page_size_is_capped(self):
+        self._create_comments_with_past_publish_date(self.post_2, True, 120)
+        path = reverse("api_v1:post_comments", args=(self.post_2.slug,))
+
+        response = self.client.get(path)
+        self.assertEqual(
+            CommentCursorPagination.page_size, len(response.json()["results"])
+        )
+        response = self.client.get(path, {"page_size": 1000})
+        self.assertEqual(
+            CommentCursorPagination.max_page_size, len(response.json()["results"])
+        )
+
+    def test_get_comments_since(self):
+        path = reverse("api_v1:post_comments", args=(self.post_1.slug,))
+        since = self.post_1_published_comments[1].publish_date
+        response = self.client.get(path, {"since": since.isoformat()})
+
+        self._compare_comments(
+            self.post_1_published_comments[:1], response.json()["results"]
+        )
+
+    def test_400_when_since_is_invalid(self):
+        path = reverse("api_v1:post_comments", args=(self.post_1.slug,))
+        response = self.client.get(path, {"since": "yesterday"})
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+
+    def test_add_comment_does_not_load_post_content(self):
+        path = reverse("api_v1:post_comments", args=(self.post_3.slug,))
+        with CaptureQueriesContext(connection) as context:
+            self.client.post(path, data=self._get_comment_data())
+
+        post_queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith("SELECT") and '"blog_post"' in query["sql"]
+        ]
+        self.assertTrue(post_queries)
+        for sql in post_queries:
+            self.assertNotIn('"blog_post"."content"', sql)
@@ -0,0 +1,145 @@
+import datetime
+from datetime import timedelta
+from io import StringIO
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from blog_app.blog.cache import get_cache
+from blog_app.blog.factories import PostFactory
+from blog_app.blog.models import ArchiveMonth, Post
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+
+def _date(year, month, day=1):
+    return timezone.make_aware(datetime.datetime(year, month, day, 12))
+
+
+class ArchiveMonthTest(TestCase):
+    def _counts(self):
+        return dict(ArchiveMonth.objects.values_list("month", "post_count"))
+
+    def test_published_posts_are_counted(self):
+        PostFactory(publish_date=_date(2020, 1), status=Post.STATUS.PUBLISH)
+        PostFactory(publish_date=_date(2020, 1, 20), status=Post.STATUS.PUBLISH)
+        PostFactory(publish_date=_date(2020, 2), status=Post.STATUS.DRAFT)
+
+        self.assertEqual({datetime.date(2020, 1, 1): 2}, self._counts())
+
+    def test_publish_reschedule_unpublish_and_delete(self):
+        post = PostFactory(publish_date=_date(2020, 1), status=Post.STATUS.DRAFT)
+        post.status = Post.STATUS.PUBLISH
+        post.save()
+        self.assertEqual({datetime.date(2020, 1, 1): 1}, self._counts())
+
+        post.publish_date = _date(2020, 3)
+        post.save()
+        self.assertEqual(
+            {datetime.date(2020, 1, 1): 0, datetime.date(2020, 3, 1): 1},
+            self._counts(),
+        )
+
+        post.status = Post.STATUS.DRAFT
+        post.save()
+        self.assertEqual(0, self._counts()[datetime.date(2020, 3, 1)])
+
+        post.status = Post.STATUS.PUBLISH
+        post.save()
+        post.delete()
+        self.assertEqual(0, self._counts()[datetime.date(2020, 3, 1)])
+
+    def test_rebuild_command(self):
+        PostFactory(publish_date=_date(2020, 1), status=Post.STATUS.PUBLISH)
+        ArchiveMonth.objects.update(post_count=5)
+        ArchiveMonth.objects.create(month=datetime.date(2019, 1, 1), post_count=1)
+
+        out = StringIO()
+        call_command("blog_rebuild_archive", stdout=out)
+
+        self.assertIn("Successfully rebuilt archive of 1 months", out.getvalue())
+        self.assertEqual({datetime.date(2020, 1, 1): 1}, self._counts())
+
+
+class PostArchiveTest(APITestCase):
+    def setUp(self) -> None:
+        get_cache().clear()
+        now = timezone.localtime()
+        self.old_posts = [
+            PostFactory(publish_date=_date(2020, 1, day), status=Post.STATUS.PUBLISH)
+            for day in (10, 20)
+        ]
+        PostFactory(publish_date=_date(2020, 2), status=Post.STATUS.PUBLISH)
+        self.recent = PostFactory(
+            publish_date=now - timedelta(seconds=1), status=Post.STATUS.PUBLISH
+        )
+        # Scheduled later this month and next month.
+        self.scheduled = PostFactory(
+            publish_date=now + timedelta(seconds=1), status=Post.STATUS.PUBLISH
+        )
+        PostFactory(publish_date=now + timedelta(days=40), status=Post.STATUS.PUBLISH)
+        self.current = now.date().replace(day=1)
+
+    def test_archive_counts_visible_posts_per_month(self):
+        response = self.client.get(reverse("api_v1:post_archive"))
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual(
+            [
+                {
+                    "year": self.current.year,
+                    "month": self.current.month,
+                    "post_count": 1,
+                },
+                {"year": 2020, "month": 2, "post_count": 1},
+                {"year": 2020, "month": 1, "post_count": 2},
+            ],
+            response.json(),
+        )
+
+    @override_settings(BLOG_API_CACHE={"ENABLED": False})
+    def test_month_lists_its_posts(self):
+        path = reverse("api_v1:post_archive_month", args=(2020, 1))
+        with self.assertNumQueries(1):
+            response = self.client.get(path)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual(
+            [post.slug for post in reversed(self.old_posts)],
+            [post["slug"] for post in response.json()["results"]],
+        )
+
+    def test_month_is_paginated(self):
+        path = reverse("api_v1:post_archive_month", args=(2020, 1))
+        received = self.client.get(path, {"page_size": 1}).json()
+
+        self.assertEqual(self.old_posts[1].slug, received["results"][0]["slug"])
+        received = self.client.get(received["next"]).json()
+        self.assertEqual(self.old_posts[0].slug, received["results"][0]["slug"])
+
+    def test_invalid_month(self):
+        for args in ((2020, 13), (2020, 0), (99999, 1)):
+            with self.subTest(args=args):
+                path = reverse("api_v1:post_archive_month", args=args)
+                response = self.client.get(path)
+                self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+    def test_archive_paths(self):
+        self.assertEqual("/api/v1/archive/", reverse("api_v1:post_archive"))
+        self.assertEqual(
+            "/api/v1/posts/archive/2020/1/",
+            reverse("api_v1:post_archive_month", args=(2020, 1)),
+        )
+
+    def test_post_with_archive_slug_is_reachable(self):
+        post = PostFactory(
+            slug="archive",
+            publish_date=timezone.now() - timedelta(days=1),
+            status=Post.STATUS.PUBLISH,
+        )
+        response = self.client.get(reverse("api_v1:post", args=(post.slug,)))
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual(post.title, response.json()["title"])
@@ -0,0 +1,226 @@
+import time
+import warnings
+from datetime import timedelta
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from blog_app.blog.admin import CommentAdmin
+from blog_app.blog.api.v1.views import CommentsList, PostsList
+from blog_app.blog.cache import get_cache, get_versions, post_version_key
+from blog_app.blog.checks import check_shared_cache
+from blog_app.blog.factories import CommentFactory, PostFactory
+from blog_app.blog.models import Comment, Post
+from blog_app.blog.negative_cache import hidden_slugs
+from django.contrib.admin.sites import AdminSite
+from django.core.cache import CacheKeyWarning
+from django.db import transaction
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+
+class ResponseCacheTest(APITestCase):
+    def setUp(self) -> None:
+        get_cache().clear()
+        self.post = PostFactory(
+            publish_date=timezone.now() - timedelta(days=1),
+            status=Post.STATUS.PUBLISH,
+        )
+        self.comment = CommentFactory(post=self.post, published=True)
+        self.posts_path = reverse("api_v1:posts")
+        self.post_path = reverse("api_v1:post", args=(self.post.slug,))
+        self.comments_path = reverse("api_v1:post_comments", args=(self.post.slug,))
+
+    def _count_comments(self):
+        return len(self.client.get(self.comments_path).json()["results"])
+
+    def test_repeated_requests_are_served_from_cache(self):
+        for path in (self.posts_path, self.post_path, self.comments_path):
+            first = self.client.get(path)
+            with self.assertNumQueries(0):
+                second = self.client.get(path)
+            self.assertEqual(status.HTTP_200_OK, second.status_code)
+            self.assertEqual(first.content, second.content)
+            self.assertEqual(first["Content-Type"], second["Content-Type"])
+
+    def test_query_string_is_part_of_the_key(self):
+        PostFactory(publish_date=timezone.now() - timedelta(days=2))
+        self.client.get(self.posts_path, {"limit": 1})
+        response = self.client.get(self.posts_path, {"limit": 2})
+        self.assertEqual(2, len(response.json()["results"]))
+
+    def test_cached_response_answers_conditional_get(self):
+        etag = self.client.get(self.post_path)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(self.post_path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+
+    def test_post_save_invalidates_list_and_detail(self):
+        self.client.get(self.posts_path)
+        self.client.get(self.post_path)
+        self.post.summary = "Changed summary"
+        self.post.save()
+
+        received = self.client.get(self.posts_path).json()["results"][0]
+        self.assertEqual("Changed summary", received["summary"])
+        self.assertEqual(
+            "Changed summary", self.client.get(self.post_path).json()["summary"]
+        )
+
+    def test_slug_change_invalidates_previous_slug(self):
+        self.client.get(self.post_path)
+        self.post.slug = "new-slug"
+        self.post.save()
+
+        response = self.client.get(self.post_path)
+        self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+    def test_post_delete_invalidates_detail(self):
+        self.client.get(self.post_path)
+        self.post.delete()
+
+        response = self.client.get(self.post_path)
+        self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+
+    def test_comment_save_and_delete_invalidate_comments(self):
+        self.client.get(self.comments_path)
+        CommentFactory(post=self.post, published=True)
+        self.assertEqual(2, self._count_comments())
+
+        self.comment.delete()
+        self.assertEqual(1, self._count_comments())
+
+    def test_admin_actions_invalidate_comments(self):
+        comment_admin = CommentAdmin(Comment, AdminSite())
+        self.client.get(self.comments_path)
+
+        comment_admin.make_unpublished(None, Comment.objects.all())
+        self.assertEqual(0, self._count_comments())
+
+        comment_admin.make_published(None, Comment.objects.filter(published=False))
+        self.assertEqual(1, self._count_comments())
+
+    @override_settings(BLOG_API_CACHE={"ENABLED": False})
+    def test_cache_can_be_disabled(self):
+        self.client.get(self.post_path)
+        with self.assertNumQueries(1):
+            self.client.get(self.post_path)
+
+
+class VisibilityBoundaryTest(APITestCase):
+    def setUp(self) -> None:
+        get_cache().clear()
+        self.post = PostFactory(
+            publish_date=timezone.now() - timedelta(days=1),
+            status=Post.STATUS.PUBLISH,
+        )
+
+    def test_next_publish_date_ignores_drafts_and_visible_posts(self):
+        PostFactory(
+            publish_date=timezone.now() + timedelta(minutes=5),
+            status=Post.STATUS.DRAFT,
+        )
+        self.assertIsNone(Post.objects.get_next_publish_date())
+
+        scheduled = PostFactory(
+            publish_date=timezone.now() + timedelta(minutes=10),
+            status=Post.STATUS.PUBLISH,
+        )
+        PostFactory(
+            publish_date=timezone.now() + timedelta(minutes=20),
+            status=Post.STATUS.PUBLISH,
+        )
+        self.assertEqual(scheduled.publish_date, Post.objects.get_next_publish_date())
+
+    def test_list_timeout_without_scheduled_posts(self):
+        self.assertEqual(60 * 5, PostsList().get_cache_timeout())
+
+    def test_list_timeout_is_capped_at_next_scheduled_post(self):
+        PostFactory(
+            publish_date=timezone.now() + timedelta(seconds=30),
+            status=Post.STATUS.PUBLISH,
+        )
+        timeout = PostsList().get_cache_timeout()
+        self.assertGreaterEqual(timeout, 1)
+        self.assertLessEqual(timeout, 30)
+
+    def test_comments_timeout_is_capped_at_next_scheduled_comment(self):
+        CommentFactory(
+            post=self.post,
+            published=True,
+            publish_date=timezone.now() + timedelta(seconds=60),
+        )
+        CommentFactory(
+            post=self.post,
+            published=False,
+            publish_date=timezone.now() + timedelta(seconds=10),
+        )
+        view = CommentsList()
+        view.boundary = view.get_validators(self.post.slug)[-1]
+        timeout = view.get_cache_timeout(slug=self.post.slug)
+        self.assertGreater(timeout, 10)
+        self.assertLessEqual(timeout, 60)
+
+    def test_batch_boundary_key_is_valid_for_memcached(self):
+        slugs = ["slug-{}".format(number) for number in range(50)]
+        path = reverse("api_v1:post_batch")
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", CacheKeyWarning)
+            self.client.get(path, {"slugs": ",".join(slugs)})
+
+        self.assertEqual([], [w for w in caught if w.category is CacheKeyWarning])
+
+    def test_scheduled_post_is_listed_once_visible(self):
+        PostFactory(
+            publish_date=timezone.now() + timedelta(seconds=1),
+            status=Post.STATUS.PUBLISH,
+        )
+        path = reverse("api_v1:posts")
+        self.assertEqual(1, len(self.client.get(path).json()["results"]))
+
+        time.sleep(1.5)
+        self.assertEqual(2, len(self.client.get(path).json()["results"]))
+
+
+class InvalidationOnCommitTest(TransactionTestCase):
+    def setUp(self) -> None:
+        get_cache().clear()
+        hidden_slugs.clear()
+        self.post = PostFactory(status=Post.STATUS.DRAFT)
+
+    def test_versions_are_bumped_again_on_commit(self):
+        key = post_version_key(self.post.slug)
+        with transaction.atomic():
+            self.post.title = "New title"
+            self.post.save()
+            # Another request reads the old row and caches it under this version.
+            during = get_versions([key])
+
+        self.assertNotEqual(during, get_versions([key]))
+
+    @override_settings(
+        BLOG_NEGATIVE_CACHE={"ENABLED": True, "TIMEOUT": 30, "SHARED": False}
+    )
+    def test_slug_hidden_before_commit_is_evicted(self):
+        with transaction.atomic():
+            self.post.status = Post.STATUS.PUBLISH
+            self.post.publish_date = timezone.now() - timedelta(days=1)
+            self.post.save()
+            hidden_slugs.add(self.post.slug)
+
+        self.assertFalse(hidden_slugs.is_hidden(self.post.slug))
+
+
+class SharedCacheCheckTest(SimpleTestCase):
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_per_process_cache_is_reported(self):
+        self.assertEqual(["blog.W001"], [w.id for w in check_shared_cache(None)])
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+    )
+    def test_shared_cache_is_accepted(self):
+        self.assertEqual([], check_shared_cache(None))
@@ -0,0 +1,58 @@
+from io import StringIO
+
+from blog_app.blog.factories import UserFactory
+from blog_app.blog.models import Comment, Post
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+
+class AddSampleDataTest(TestCase):
+    def setUp(self) -> None:
+        self.user = UserFactory()
+
+    def _call(self, *args):
+        call_command(
+            "blog_add_sample_data", self.user.username, *args, stdout=StringIO()
+        )
+
+    def test_add_posts(self):
+        self._call("3")
+        self.assertEqual(3, Post.objects.filter(author=self.user).count())
+
+    def test_bulk_add_posts_with_comments(self):
+        self._call("25", "--bulk", "--batch-size", "10", "--comments-per-post", "2")
+
+        self.assertEqual(25, Post.objects.filter(author=self.user).count())
+        self.assertEqual(50, Comment.objects.count())
+        for post in Post.objects.all():
+            self.assertEqual(2, post.comments.count())
+            self.assertEqual(2, post.comment_count)
+
+    def test_bulk_ratios(self):
+        self._call("200", "--bulk", "--draft-ratio", "0.5", "--future-ratio", "0.25")
+
+        drafts = Post.objects.filter(status=Post.STATUS.DRAFT).count()
+        future = Post.objects.filter(publish_date__gt=timezone.now()).count()
+        self.assertTrue(60 < drafts < 140)
+        self.assertTrue(20 < future < 80)
+
+    def test_bulk_data_is_reproducible_with_seed(self):
+        fields = ("title", "summary", "content", "status")
+        self._call("5", "--bulk", "--seed", "7", "--draft-ratio", "0.5")
+        first = list(Post.objects.order_by("title").values_list(*fields))
+        Post.objects.all().delete()
+
+        self._call("5", "--bulk", "--seed", "7", "--draft-ratio", "0.5")
+        second = list(Post.objects.order_by("title").values_list(*fields))
+        self.assertEqual(first, second)
+
+    def test_error_when_bulk_posts_already_exist(self):
+        self._call("2", "--bulk")
+        with self.assertRaises(CommandError):
+            self._call("2", "--bulk")
+
+    def test_error_when_user_does_not_exist(self):
+        with self.assertRaises(CommandError):
+            call_command("blog_add_sample_data", "nobody", "1", stdout=StringIO())
@@ -0,0 +1,173 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from rest_framework.test import APITestCase
+
+from blog_app.blog.admin import CommentAdmin
+from blog_app.blog.cache import get_cache
+from blog_app.blog.factories import CommentFactory, PostFactory
+from blog_app.blog.management.commands import blog_repair_comment_stats
+from blog_app.blog.models import Comment, Post
+from django.contrib.admin.sites import AdminSite
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+
+class CommentStatsTest(TestCase):
+    def setUp(self) -> None:
+        self.post = PostFactory()
+        self.now = timezone.now()
+
+    def _assert_stats(self, count, last_comment_at):
+        self.post.refresh_from_db()
+        self.assertEqual(count, self.post.comment_count)
+        self.assertEqual(last_comment_at, self.post.last_comment_at)
+
+    def _comment(self, days_ago, published=True):
+        return CommentFactory(
+            post=self.post,
+            published=published,
+            publish_date=self.now - timedelta(days=days_ago),
+        )
+
+    def test_published_comments_are_counted(self):
+        self._comment(2)
+        newest = self._comment(1)
+        self._comment(0, published=False)
+
+        self._assert_stats(2, newest.publish_date)
+
+    def test_publish_and_unpublish(self):
+        older = self._comment(2)
+        newest = self._comment(1, published=False)
+
+        newest.published = True
+        newest.save()
+        self._assert_stats(2, newest.publish_date)
+
+        newest.published = False
+        newest.save()
+        self._assert_stats(1, older.publish_date)
+
+    def test_delete(self):
+        comment = self._comment(1)
+        comment.delete()
+
+        self._assert_stats(0, None)
+
+    def test_moving_comment_to_another_post(self):
+        comment = self._comment(1)
+        other_post = PostFactory()
+        comment.post = other_post
+        comment.save()
+
+        self._assert_stats(0, None)
+        other_post.refresh_from_db()
+        self.assertEqual(1, other_post.comment_count)
+
+    def test_admin_actions(self):
+        comments = [self._comment(days, published=False) for days in (3, 2, 1)]
+        comment_admin = CommentAdmin(Comment, AdminSite())
+
+        comment_admin.make_published(None, Comment.objects.all())
+        self._assert_stats(3, comments[2].publish_date)
+
+        comment_admin.make_published(None, Comment.objects.all())
+        self._assert_stats(3, comments[2].publish_date)
+
+        comment_admin.make_unpublished(None, Comment.objects.filter(pk=comments[2].pk))
+        self._assert_stats(2, comments[1].publish_date)
+
+    def test_scheduled_comments_are_counted_once_due(self):
+        visible = self._comment(1)
+        scheduled = self._comment(-1)
+        CommentAdmin(Comment, AdminSite()).make_published(
+            None, Comment.objects.filter(pk=self._comment(-2, published=False).pk)
+        )
+        self._assert_stats(1, visible.publish_date)
+
+        later = self.now + timedelta(days=1, hours=1)
+        with mock.patch("django.utils.timezone.now", return_value=later):
+            blog_repair_comment_stats.Command().count_due_comments(self.now)
+        self._assert_stats(2, scheduled.publish_date)
+
+    def test_due_comment_not_counted_yet_is_not_subtracted(self):
+        visible = self._comment(2)
+        unpublished = self._comment(-1)
+        deleted = self._comment(-1)
+
+        later = self.now + timedelta(days=1, hours=1)
+        with mock.patch("django.utils.timezone.now", return_value=later):
+            deleted.delete()
+            self._assert_stats(2, unpublished.publish_date)
+
+            CommentAdmin(Comment, AdminSite()).make_unpublished(
+                None, Comment.objects.filter(pk=unpublished.pk)
+            )
+            self._assert_stats(1, visible.publish_date)
+
+            visible.delete()
+        self._assert_stats(0, None)
+
+    def test_rescheduling_comment_stops_counting_it(self):
+        comment = self._comment(1)
+        comment.publish_date = self.now + timedelta(days=1)
+        comment.save()
+
+        self._assert_stats(0, None)
+
+    def test_post_save_keeps_stats_updated_after_load(self):
+        post = Post.objects.get(pk=self.post.pk)
+        comment = self._comment(1)
+        post.summary = "Changed summary"
+        post.save()
+
+        self._assert_stats(1, comment.publish_date)
+        self.assertEqual("Changed summary", self.post.summary)
+
+    def test_repair_command(self):
+        comment = self._comment(1)
+        Post.objects.update(comment_count=10, last_comment_at=None)
+        empty_post = PostFactory()
+        Post.objects.filter(pk=empty_post.pk).update(comment_count=3)
+
+        out = StringIO()
+        call_command("blog_repair_comment_stats", "--batch-size", "1", stdout=out)
+
+        self.assertIn("Successfully repaired stats of 2 posts", out.getvalue())
+        self._assert_stats(1, comment.publish_date)
+        empty_post.refresh_from_db()
+        self.assertEqual(0, empty_post.comment_count)
+
+
+class PostListCommentStatsTest(APITestCase):
+    def setUp(self) -> None:
+        get_cache().clear()
+        self.post = PostFactory(
+            publish_date=timezone.now() - timedelta(days=1),
+            status=Post.STATUS.PUBLISH,
+        )
+        self.path = reverse("api_v1:posts")
+
+    def test_publishing_comment_invalidates_list(self):
+        comment = CommentFactory(post=self.post, published=False)
+        received = self.client.get(self.path).json()["results"][0]
+        self.assertEqual(0, received["comment_count"])
+
+        comment.published = True
+        comment.save()
+        received = self.client.get(self.path).json()["results"][0]
+
+        self.assertEqual(1, received["comment_count"])
+        self.assertIsNotNone(received["last_comment_at"])
+
+    @override_settings(BLOG_API_CACHE={"ENABLED": False})
+    def test_stats_do_not_add_queries(self):
+        CommentFactory.create_batch(3, post=self.post, published=True)
+        with self.assertNumQueries(1):
+            received = self.client.get(self.path, {"page_size": 10}).json()
+
+        self.assertEqual(3, received["results"][0]["comment_count"])
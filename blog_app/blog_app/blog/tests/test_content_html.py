@@ -0,0 +1,97 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from rest_framework.test import APITestCase
+
+from blog_app.blog import models
+from blog_app.blog.cache import get_cache
+from blog_app.blog.factories import PostFactory
+from blog_app.blog.models import Post
+from blog_app.blog.rendering import render_markdown
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+
+class RenderMarkdownTest(SimpleTestCase):
+    def test_markdown_is_rendered(self):
+        self.assertEqual(
+            "<h1>Title</h1>\n<p><strong>bold</strong></p>",
+            render_markdown("# Title\n\n**bold**"),
+        )
+
+    def test_html_is_sanitized(self):
+        html = render_markdown(
+            '<script>alert(1)</script>\n\n<img src="a.png" onerror="alert(1)">\n\n'
+            "[link](javascript:alert(1))"
+        )
+
+        self.assertNotIn("<script>", html)
+        self.assertNotIn("onerror", html)
+        self.assertNotIn("javascript:", html)
+        self.assertIn('<img src="a.png">', html)
+
+
+class ContentHtmlTest(TestCase):
+    def setUp(self) -> None:
+        self.post = PostFactory(content="*first*")
+
+    def test_content_is_rendered_on_save(self):
+        self.assertEqual("<p><em>first</em></p>", self.post.content_html)
+
+        self.post.content = "*second*"
+        self.post.save()
+        self.post.refresh_from_db()
+        self.assertEqual("<p><em>second</em></p>", self.post.content_html)
+
+    def test_unchanged_content_is_not_rendered_again(self):
+        post = Post.objects.get(pk=self.post.pk)
+        with mock.patch.object(models, "render_markdown") as render:
+            post.title = "New title"
+            post.save()
+            post.save()
+            Post.objects.only("title").get(pk=post.pk).save()
+
+        render.assert_not_called()
+
+    def test_save_with_update_fields_stores_html(self):
+        self.post.content = "*second*"
+        self.post.save(update_fields=["content"])
+
+        self.post.refresh_from_db()
+        self.assertEqual("<p><em>second</em></p>", self.post.content_html)
+
+    def test_render_command(self):
+        other = PostFactory(content="*other*")
+        Post.objects.update(content_html="")
+        Post.objects.filter(pk=other.pk).update(content_html="kept")
+
+        out = StringIO()
+        call_command("blog_render_content", "--batch-size", "1", stdout=out)
+
+        self.assertIn("Successfully rendered content of 1 posts", out.getvalue())
+        self.post.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual("<p><em>first</em></p>", self.post.content_html)
+        self.assertEqual("kept", other.content_html)
+
+        call_command("blog_render_content", "--all", stdout=out)
+        other.refresh_from_db()
+        self.assertEqual("<p><em>other</em></p>", other.content_html)
+
+
+class PostContentHtmlApiTest(APITestCase):
+    def test_post_detail_has_rendered_content(self):
+        get_cache().clear()
+        post = PostFactory(
+            content="**bold**",
+            publish_date=timezone.now() - timedelta(days=1),
+            status=Post.STATUS.PUBLISH,
+        )
+        response = self.client.get(reverse("api_v1:post", args=(post.slug,)))
+
+        self.assertEqual(
+            "<p><strong>bold</strong></p>", response.json()["content_html"]
+        )
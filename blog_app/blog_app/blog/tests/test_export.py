@@ -0,0 +1,145 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from rest_framework.test import APITestCase
+
+from blog_app.blog.cache import get_cache
+from blog_app.blog.export import StaticExporter
+from blog_app.blog.factories import CommentFactory, PostFactory
+from blog_app.blog.models import Post
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+
+class StaticExportTest(APITestCase):
+    def setUp(self) -> None:
+        get_cache().clear()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.output = self.directory.name
+        self.posts = [
+            PostFactory(
+                publish_date=timezone.now() - timedelta(days=days),
+                status=Post.STATUS.PUBLISH,
+            )
+            for days in (1, 2, 3)
+        ]
+        CommentFactory.create_batch(3, post=self.posts[0], published=True)
+        self.exporter = StaticExporter(self.output, "http://localhost", page_size=2)
+
+    def _read(self, name):
+        with open(os.path.join(self.output, name), "rb") as exported:
+            return exported.read()
+
+    def _exists(self, name):
+        return os.path.exists(os.path.join(self.output, name))
+
+    def test_files_match_api_responses(self):
+        self.exporter.export()
+        post = self.posts[0]
+        expected = {
+            "api/v1/posts/index.json": reverse("api_v1:posts"),
+            "api/v1/posts/{}/index.json".format(post.slug): reverse(
+                "api_v1:post", args=(post.slug,)
+            ),
+            "api/v1/posts/{}/comments.json".format(post.slug): reverse(
+                "api_v1:post_comments", args=(post.slug,)
+            ),
+        }
+        for name, path in expected.items():
+            with self.subTest(name=name):
+                response = self.client.get(path, HTTP_HOST="localhost")
+                self.assertEqual(response.json(), json.loads(self._read(name)))
+
+    def test_list_pages_follow_next_links(self):
+        self.exporter.export()
+
+        first_page = json.loads(self._read("api/v1/posts/index?page_size=2.json"))
+        query = first_page["next"].split("?", 1)[1]
+        second_page = json.loads(self._read("api/v1/posts/index?{}.json".format(query)))
+
+        slugs = [post["slug"] for post in first_page["results"]]
+        slugs += [post["slug"] for post in second_page["results"]]
+        self.assertEqual([post.slug for post in self.posts], slugs)
+        self.assertIsNone(second_page["next"])
+
+    def test_incremental_export_rewrites_changed_posts_only(self):
+        self.exporter.export()
+        written, removed = self.exporter.export()
+        self.assertEqual((0, 0), (written, removed))
+
+        post = self.posts[1]
+        post.title = "New title"
+        post.save()
+        written, _ = self.exporter.export()
+
+        # The post, its comments and the three list files.
+        self.assertEqual(5, written)
+        detail = json.loads(self._read("api/v1/posts/{}/index.json".format(post.slug)))
+        self.assertEqual("New title", detail["title"])
+
+    def test_new_comment_rewrites_post_comments(self):
+        self.exporter.export()
+        post = self.posts[2]
+        CommentFactory(post=post, published=True, body="New comment")
+        self.exporter.export()
+
+        name = "api/v1/posts/{}/comments.json".format(post.slug)
+        comments = json.loads(self._read(name))
+        self.assertEqual(["New comment"], [c["body"] for c in comments["results"]])
+
+    def test_edited_comment_rewrites_post_comments(self):
+        self.exporter.export()
+        post = self.posts[0]
+        comment = post.comments.first()
+        comment.body = "Edited comment"
+        comment.save()
+        written, _ = self.exporter.export()
+
+        # The post and its comments, not the list.
+        self.assertEqual(2, written)
+        name = "api/v1/posts/{}/comments.json".format(post.slug)
+        bodies = [c["body"] for c in json.loads(self._read(name))["results"]]
+        self.assertIn("Edited comment", bodies)
+
+    def test_unpublished_post_is_removed(self):
+        self.exporter.export()
+        post = self.posts[0]
+        post.status = Post.STATUS.DRAFT
+        post.save()
+        _, removed = self.exporter.export()
+
+        self.assertEqual(3, removed)
+        self.assertFalse(self._exists("api/v1/posts/{}".format(post.slug)))
+        index = json.loads(self._read("api/v1/posts/index.json"))
+        slugs = [p["slug"] for p in index["results"]]
+        self.assertNotIn(post.slug, slugs)
+
+    def test_scheduled_post_is_exported_once_due(self):
+        scheduled = PostFactory(
+            publish_date=timezone.now() + timedelta(days=1),
+            status=Post.STATUS.PUBLISH,
+        )
+        self.exporter.export()
+        self.assertFalse(self._exists("api/v1/posts/{}".format(scheduled.slug)))
+
+        Post.objects.filter(pk=scheduled.pk).update(
+            publish_date=timezone.now() - timedelta(minutes=1)
+        )
+        self.exporter.export()
+
+        self.assertTrue(
+            self._exists("api/v1/posts/{}/index.json".format(scheduled.slug))
+        )
+
+    def test_command(self):
+        out = StringIO()
+        call_command("blog_export_static", self.output, "--page-size", "2", stdout=out)
+        call_command("blog_export_static", self.output, "--full", stdout=out)
+
+        self.assertIn("Successfully exported 9 files, removed 0", out.getvalue())
+        self.assertIn("Successfully exported 8 files, removed 2", out.getvalue())
@@ -0,0 +1,141 @@
+import os
+import tempfile
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from xml.etree import ElementTree
+
+from blog_app.blog import feeds
+from blog_app.blog.factories import CommentFactory, PostFactory
+from blog_app.blog.models import Post
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+SITEMAP_NS = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+
+
+class FeedsTest(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        settings_override = override_settings(
+            BLOG_FEEDS={
+                "TITLE": "Blog",
+                "SITE_URL": "https://example.com",
+                "POST_URL": "https://example.com/posts/{slug}",
+                "ITEMS": 50,
+                "DIR": self.directory.name,
+                "GRACE_SECONDS": 60,
+            }
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.published = PostFactory(
+            publish_date=timezone.now() - timedelta(days=1),
+            status=Post.STATUS.PUBLISH,
+        )
+        self.draft = PostFactory(
+            publish_date=timezone.now() - timedelta(days=1),
+            status=Post.STATUS.DRAFT,
+        )
+        self.scheduled = PostFactory(
+            publish_date=timezone.now() + timedelta(days=1),
+            status=Post.STATUS.PUBLISH,
+        )
+        feeds.build()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def _sitemap_slugs(self):
+        root = ElementTree.fromstring(self.client.get(reverse("sitemap")).content)
+        return [
+            loc.text.rsplit("/", 1)[1] for loc in root.iter(SITEMAP_NS + "loc")
+        ]
+
+    def test_documents_list_only_published_posts(self):
+        rss = self.client.get(reverse("rss_feed"))
+        atom = self.client.get(reverse("atom_feed"))
+
+        self.assertEqual("application/rss+xml; charset=utf-8", rss["Content-Type"])
+        self.assertEqual("application/atom+xml; charset=utf-8", atom["Content-Type"])
+        for response in (rss, atom):
+            self.assertIn(self.published.title, response.content.decode())
+            self.assertNotIn(self.draft.title, response.content.decode())
+            self.assertNotIn(self.scheduled.title, response.content.decode())
+        self.assertEqual([self.published.slug], self._sitemap_slugs())
+
+    def test_documents_are_served_without_building(self):
+        with mock.patch.object(feeds, "build_documents") as build_documents:
+            with self.assertNumQueries(0):
+                response = self.client.get(reverse("rss_feed"))
+
+        build_documents.assert_not_called()
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(4, len(os.listdir(self.directory.name)))
+
+    def test_404_before_first_build(self):
+        os.remove(os.path.join(self.directory.name, feeds.CURRENT))
+        self.assertEqual(404, self.client.get(reverse("rss_feed")).status_code)
+
+    def test_comments_do_not_rebuild_documents(self):
+        CommentFactory(post=self.published, published=True)
+        with mock.patch.object(feeds, "build_documents") as build_documents:
+            self.assertFalse(feeds.build()[1])
+
+        build_documents.assert_not_called()
+
+    def test_post_change_rebuilds_documents(self):
+        etag = self.client.get(reverse("rss_feed"))["ETag"]
+        self.published.title = "Changed title"
+        self.published.save()
+        self.assertEqual(etag, self.client.get(reverse("rss_feed"))["ETag"])
+
+        self.assertTrue(feeds.build()[1])
+        response = self.client.get(reverse("rss_feed"))
+        self.assertNotEqual(etag, response["ETag"])
+        self.assertIn("Changed title", response.content.decode())
+
+    def test_replaced_documents_are_pruned_after_grace_period(self):
+        leftover = os.path.join(self.directory.name, ".abandoned.tmp")
+        open(leftover, "w").close()
+        self.published.title = "Changed title"
+        self.published.save()
+        feeds.build()
+        # The replaced documents and the temporary file are still there.
+        self.assertEqual(8, len(os.listdir(self.directory.name)))
+
+        later = time.time() + 61
+        with mock.patch.object(feeds.time, "time", return_value=later):
+            feeds.prune(feeds.get_current()[0])
+        self.assertEqual(4, len(os.listdir(self.directory.name)))
+
+    def test_scheduled_post_appears_when_due(self):
+        self.assertEqual([self.published.slug], self._sitemap_slugs())
+        later = timezone.now() + timedelta(days=2)
+        with mock.patch("django.utils.timezone.now", return_value=later):
+            self.assertTrue(feeds.build()[1])
+        slugs = self._sitemap_slugs()
+
+        self.assertSetEqual({self.published.slug, self.scheduled.slug}, set(slugs))
+
+    def test_conditional_get(self):
+        response = self.client.get(reverse("atom_feed"))
+        not_modified = self.client.get(
+            reverse("atom_feed"), HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        self.assertEqual(304, not_modified.status_code)
+        self.assertIn("Last-Modified", response)
+
+    def test_build_command(self):
+        out = StringIO()
+        call_command("blog_build_feeds", stdout=out)
+        self.assertIn("are up to date", out.getvalue())
+
+        call_command("blog_build_feeds", "--force", stdout=out)
+        self.assertIn("Successfully built feeds", out.getvalue())
+        self.assertEqual(4, len(os.listdir(self.directory.name)))
@@ -0,0 +1,36 @@
+from unittest import skipUnless
+
+from blog_app.blog.factories import CommentFactory, PostFactory
+from blog_app.blog.models import Post
+from django.db import connection
+from django.test import TestCase
+
+
+@skipUnless(connection.vendor == "postgresql", "EXPLAIN output is Postgres specific")
+class PublishedIndexesTest(TestCase):
+    def setUp(self) -> None:
+        self.post = PostFactory(status=Post.STATUS.PUBLISH)
+        CommentFactory.create_batch(3, post=self.post, published=True)
+        PostFactory.create_batch(3, status=Post.STATUS.DRAFT)
+
+    def _explain(self, queryset):
+        # The test tables are tiny, so the planner would pick a sequential or
+        # bitmap scan, and statistics left by other tests would sway it.
+        # Refresh them and disable both to check the index serves the query.
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE blog_post, blog_comment")
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_bitmapscan = off")
+        return queryset.explain()
+
+    def test_published_posts_use_partial_index(self):
+        plan = self._explain(Post.objects.get_published_posts())
+
+        self.assertIn("blog_post_published_idx", plan)
+        self.assertNotIn("Sort", plan)
+
+    def test_published_comments_use_composite_index(self):
+        plan = self._explain(self.post.get_published_comments())
+
+        self.assertIn("blog_comment_published_idx", plan)
+        self.assertNotIn("Sort", plan)
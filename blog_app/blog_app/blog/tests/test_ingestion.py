@@ -0,0 +1,152 @@
+import fcntl
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+import factory
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from blog_app.blog.factories import CommentFactory, PostFactory
+from blog_app.blog.ingestion import DatabaseCommentQueue, FileCommentQueue
+from blog_app.blog.models import Comment, PendingComment, Post
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+
+def _comment_data(post):
+    comment = factory.build(dict, FACTORY_CLASS=CommentFactory)
+    return {
+        "post_id": post.pk,
+        "name": comment["name"],
+        "email": comment["email"],
+        "body": comment["body"],
+    }
+
+
+class DatabaseCommentQueueTest(TestCase):
+    def setUp(self) -> None:
+        self.post = PostFactory()
+        self.queue = DatabaseCommentQueue()
+
+    def test_drain_writes_comments_in_batches(self):
+        for _ in range(5):
+            self.queue.put(_comment_data(self.post))
+
+        self.assertEqual(2, self.queue.drain(2))
+        self.assertEqual(2, Comment.objects.count())
+        self.assertEqual(3, PendingComment.objects.count())
+
+        self.assertEqual(3, self.queue.drain(10))
+        self.assertEqual(0, self.queue.drain(10))
+        self.assertEqual(5, Comment.objects.filter(post=self.post).count())
+        self.assertFalse(PendingComment.objects.exists())
+
+
+class FileCommentQueueTest(TestCase):
+    def setUp(self) -> None:
+        self.post = PostFactory()
+        self.directory = tempfile.TemporaryDirectory()
+        self.queue = FileCommentQueue(os.path.join(self.directory.name, "queue.jsonl"))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_drain_writes_comments_in_batches(self):
+        comments = [_comment_data(self.post) for _ in range(5)]
+        for comment in comments:
+            self.queue.put(comment)
+
+        self.assertEqual(2, self.queue.drain(2))
+        self.assertEqual(2, self.queue.drain(2))
+        self.assertEqual(1, self.queue.drain(2))
+        self.assertEqual(0, self.queue.drain(2))
+
+        self.assertEqual(
+            [comment["body"] for comment in comments],
+            list(Comment.objects.order_by("id").values_list("body", flat=True)),
+        )
+        self.assertEqual(["queue.jsonl.lock"], os.listdir(self.directory.name))
+
+    def test_comments_put_while_draining_are_not_lost(self):
+        self.queue.put(_comment_data(self.post))
+        self.assertEqual(1, self.queue.drain(1))
+        self.queue.put(_comment_data(self.post))
+
+        self.assertEqual(1, self.queue.drain(10))
+        self.assertEqual(2, Comment.objects.count())
+
+    def test_queue_is_drained_by_one_worker_at_a_time(self):
+        self.queue.put(_comment_data(self.post))
+        with open(self.queue.lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            # The lock of another worker, draining the same queue.
+            self.assertEqual(0, self.queue.drain(10))
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+        self.assertFalse(Comment.objects.exists())
+        self.assertEqual(1, self.queue.drain(10))
+        self.assertEqual(1, Comment.objects.count())
+
+    def test_comments_of_deleted_posts_are_dead_lettered(self):
+        deleted_post = PostFactory()
+        orphan = _comment_data(deleted_post)
+        self.queue.put(orphan)
+        self.queue.put(_comment_data(self.post))
+        deleted_post.delete()
+
+        self.assertEqual(1, self.queue.drain(1))
+        self.assertEqual(0, self.queue.drain(1))
+        self.assertEqual(1, Comment.objects.filter(post=self.post).count())
+        with open(self.queue.dead_letter_path) as dead_letter:
+            self.assertEqual([orphan], [json.loads(line) for line in dead_letter])
+
+
+@override_settings(
+    BLOG_COMMENT_INGESTION={
+        "MODE": "queued",
+        "QUEUE": "blog_app.blog.ingestion.DatabaseCommentQueue",
+        "BATCH_SIZE": 2,
+    },
+    BLOG_COMMENT_THROTTLING={"ENABLED": False},
+)
+class QueuedCommentIngestionTest(APITestCase):
+    def setUp(self) -> None:
+        self.post = PostFactory(
+            publish_date=timezone.now() - timedelta(days=1),
+            status=Post.STATUS.PUBLISH,
+        )
+        self.path = reverse("api_v1:post_comments", args=(self.post.slug,))
+
+    def _post_comment(self):
+        data = _comment_data(self.post)
+        data.pop("post_id")
+        return self.client.post(self.path, data=data), data
+
+    def test_202_and_comment_is_queued(self):
+        response, data = self._post_comment()
+
+        self.assertEqual(status.HTTP_202_ACCEPTED, response.status_code)
+        self.assertEqual({"name": data["name"], "body": data["body"]}, response.json())
+        self.assertFalse(Comment.objects.exists())
+        self.assertEqual(1, PendingComment.objects.count())
+
+    def test_400_is_not_queued(self):
+        response = self.client.post(self.path, data={"name": "name"})
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        self.assertFalse(PendingComment.objects.exists())
+
+    def test_command_drains_queue(self):
+        for _ in range(3):
+            self._post_comment()
+        out = StringIO()
+        call_command("blog_ingest_comments", stdout=out)
+
+        self.assertIn("Successfully wrote 3 comments", out.getvalue())
+        self.assertEqual(3, Comment.objects.filter(post=self.post).count())
+        self.assertFalse(PendingComment.objects.exists())
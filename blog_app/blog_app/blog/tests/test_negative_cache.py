@@ -0,0 +1,117 @@
+from datetime import timedelta
+from unittest import mock
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from blog_app.blog import negative_cache
+from blog_app.blog.cache import get_cache
+from blog_app.blog.factories import PostFactory
+from blog_app.blog.models import Post
+from blog_app.blog.negative_cache import NegativeCache, hidden_slugs
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+NEGATIVE_CACHE = {"ENABLED": True, "MAX_SIZE": 2, "TIMEOUT": 30, "SHARED": False}
+
+
+@override_settings(BLOG_NEGATIVE_CACHE=NEGATIVE_CACHE)
+class NegativeCacheTest(SimpleTestCase):
+    def setUp(self) -> None:
+        get_cache().clear()
+        self.cache = NegativeCache()
+
+    def test_slug_is_remembered_until_timeout(self):
+        with mock.patch.object(negative_cache.time, "time", return_value=1000.0):
+            self.assertFalse(self.cache.is_hidden("slug"))
+            self.cache.add("slug")
+            self.assertTrue(self.cache.is_hidden("slug"))
+        with mock.patch.object(negative_cache.time, "time", return_value=1031.0):
+            self.assertFalse(self.cache.is_hidden("slug"))
+
+        self.assertEqual({"hits": 1, "misses": 2, "size": 0}, self.cache.get_stats())
+
+    def test_slug_is_not_remembered_past_publish_date(self):
+        self.cache.add("slug", until=timezone.now() + timedelta(seconds=5))
+        self.assertTrue(self.cache.is_hidden("slug"))
+
+        with mock.patch.object(
+            negative_cache.time, "time", return_value=timezone.now().timestamp() + 6
+        ):
+            self.assertFalse(self.cache.is_hidden("slug"))
+
+    def test_least_recently_used_slug_is_dropped(self):
+        for slug in ("a", "b"):
+            self.cache.add(slug)
+        self.cache.is_hidden("a")
+        self.cache.add("c")
+
+        self.assertEqual(
+            [True, False, True], [self.cache.is_hidden(slug) for slug in "abc"]
+        )
+
+    def test_evict(self):
+        self.cache.add("slug")
+        self.cache.evict(["slug"])
+        self.assertFalse(self.cache.is_hidden("slug"))
+
+    @override_settings(BLOG_NEGATIVE_CACHE=dict(NEGATIVE_CACHE, SHARED=True))
+    def test_shared_slugs_are_seen_by_other_processes(self):
+        other_process = NegativeCache()
+        self.cache.add("slug")
+        self.assertTrue(other_process.is_hidden("slug"))
+
+        self.cache.evict(["slug"])
+        self.assertFalse(NegativeCache().is_hidden("slug"))
+
+    @override_settings(BLOG_NEGATIVE_CACHE=dict(NEGATIVE_CACHE, ENABLED=False))
+    def test_disabled(self):
+        self.cache.add("slug")
+        self.assertFalse(self.cache.is_hidden("slug"))
+
+
+@override_settings(BLOG_NEGATIVE_CACHE=NEGATIVE_CACHE)
+class HiddenPostApiTest(APITestCase):
+    def setUp(self) -> None:
+        get_cache().clear()
+        hidden_slugs.clear()
+
+    def _get(self, slug, name="api_v1:post"):
+        return self.client.get(reverse(name, args=(slug,)))
+
+    def test_unknown_slug_is_answered_without_query(self):
+        for name in ("api_v1:post", "api_v1:post_comments"):
+            with self.subTest(name=name):
+                self.assertEqual(404, self._get("unknown", name).status_code)
+                with self.assertNumQueries(0):
+                    response = self._get("unknown", name)
+                self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code)
+        # The comments endpoint already knows the slug from the post endpoint.
+        stats = hidden_slugs.get_stats()
+        self.assertEqual((3, 1), (stats["hits"], stats["misses"]))
+
+    def test_published_post_is_evicted(self):
+        post = PostFactory(status=Post.STATUS.DRAFT)
+        self.assertEqual(404, self._get(post.slug).status_code)
+
+        post.status = Post.STATUS.PUBLISH
+        post.publish_date = timezone.now() - timedelta(days=1)
+        post.save()
+
+        self.assertEqual(status.HTTP_200_OK, self._get(post.slug).status_code)
+
+    def test_scheduled_post_is_visible_once_due(self):
+        post = PostFactory(
+            status=Post.STATUS.PUBLISH,
+            publish_date=timezone.now() + timedelta(seconds=5),
+        )
+        self.assertEqual(404, self._get(post.slug).status_code)
+
+        due = timezone.now() + timedelta(seconds=6)
+        with mock.patch.object(
+            negative_cache.time, "time", return_value=due.timestamp()
+        ), mock.patch("django.utils.timezone.now", return_value=due):
+            response = self._get(post.slug)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
@@ -0,0 +1,73 @@
+from datetime import timedelta
+from unittest import mock
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from blog_app.blog.api.v1 import rows
+from blog_app.blog.api.v1.rows import RowSerializer
+from blog_app.blog.api.v1.serializers import CommentSerializer, ListPostSerializer
+from blog_app.blog.factories import CommentFactory, PostFactory
+from blog_app.blog.models import Comment, Post
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+
+class RowSerializerTest(APITestCase):
+    def setUp(self) -> None:
+        now = timezone.now().replace(microsecond=123456)
+        # Winter and summer dates, so both Warsaw UTC offsets are covered.
+        self.posts = [
+            PostFactory(
+                title="Zażółć gęślą jaźń \u2028 \"quoted\" </script>",
+                publish_date=now - timedelta(days=120),
+                status=Post.STATUS.PUBLISH,
+            ),
+            PostFactory(
+                publish_date=now - timedelta(days=300),
+                status=Post.STATUS.PUBLISH,
+            ),
+        ]
+        for post in self.posts:
+            CommentFactory.create_batch(
+                3, post=post, published=True, publish_date=post.publish_date
+            )
+
+    def _assert_parity(self, serializer_class, queryset):
+        row_serializer = RowSerializer(serializer_class)
+        rows_data = row_serializer.to_representation(
+            queryset.values_list(*row_serializer.fields, named=True)
+        )
+        expected = serializer_class(queryset, many=True).data
+
+        self.assertEqual(expected, rows_data)
+        with mock.patch.object(rows, "orjson", None):
+            self.assertEqual(JSONRenderer().render(expected), rows.dumps(rows_data))
+
+    def test_post_rows_match_list_post_serializer(self):
+        self._assert_parity(ListPostSerializer, Post.objects.get_published_posts())
+
+    def test_comment_rows_match_comment_serializer(self):
+        comments = Comment.objects.get_published_comments(self.posts[0].pk)
+        self._assert_parity(CommentSerializer, comments)
+
+    def test_write_only_fields_are_not_selected(self):
+        self.assertEqual(
+            ("name", "body", "publish_date"), RowSerializer(CommentSerializer).fields
+        )
+
+    @override_settings(BLOG_API_CACHE={"ENABLED": False})
+    def test_json_responses_match_browsable_api_data(self):
+        paths = [
+            (reverse("api_v1:posts"), {}),
+            (reverse("api_v1:posts"), {"page_size": 1}),
+            (reverse("api_v1:posts"), {"limit": 1, "offset": 1}),
+            (reverse("api_v1:post_comments", args=(self.posts[0].slug,)), {}),
+        ]
+        for path, params in paths:
+            json_response = self.client.get(path, params)
+            api_response = self.client.get(path, params, HTTP_ACCEPT="text/html")
+
+            self.assertEqual("application/json", json_response["Content-Type"])
+            self.assertEqual(api_response.data, json_response.json())
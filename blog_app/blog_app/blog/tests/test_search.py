@@ -0,0 +1,125 @@
+from datetime import timedelta
+from unittest import skipUnless
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from blog_app.blog.factories import PostFactory
+from blog_app.blog.models import Post
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+
+class PostSearchValidationTest(APITestCase):
+    def test_400_without_query(self):
+        for parameters in ({}, {"q": " "}):
+            response = self.client.get(reverse("api_v1:post_search"), parameters)
+            self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+
+
+class PostSearchVectorTest(TestCase):
+    def test_save_does_not_write_vector(self):
+        post = PostFactory(status=Post.STATUS.DRAFT)
+        post.status = Post.STATUS.PUBLISH
+        with CaptureQueriesContext(connection) as queries:
+            post.save()
+
+        updates = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith('UPDATE "blog_post"')
+        ]
+        self.assertEqual(1, len(updates))
+        self.assertNotIn("search_vector", updates[0])
+
+
+@skipUnless(connection.vendor == "postgresql", "full-text search needs Postgres")
+class PostSearchTest(APITestCase):
+    def setUp(self) -> None:
+        past = timezone.now() - timedelta(days=1)
+        self.title_match = PostFactory(
+            title="Tuning autovacuum", publish_date=past, status=Post.STATUS.PUBLISH
+        )
+        self.summary_match = PostFactory(
+            summary="Why autovacuum matters",
+            publish_date=past,
+            status=Post.STATUS.PUBLISH,
+        )
+        self.content_match = PostFactory(
+            content="A long text about autovacuum.",
+            publish_date=past,
+            status=Post.STATUS.PUBLISH,
+        )
+        PostFactory(title="Autovacuum draft", status=Post.STATUS.DRAFT)
+        PostFactory(
+            title="Autovacuum later",
+            publish_date=timezone.now() + timedelta(days=1),
+            status=Post.STATUS.PUBLISH,
+        )
+        PostFactory(title="Unrelated", publish_date=past, status=Post.STATUS.PUBLISH)
+
+    def _search(self, **parameters):
+        return self.client.get(reverse("api_v1:post_search"), parameters).json()
+
+    def test_published_matches_are_ranked_by_weight(self):
+        json = self._search(q="autovacuum")
+        self.assertEqual(
+            [self.title_match.slug, self.summary_match.slug, self.content_match.slug],
+            [post["slug"] for post in json["results"]],
+        )
+
+    def test_results_are_cursor_paginated(self):
+        first = self._search(q="autovacuum", page_size=2)
+        self.assertEqual(2, len(first["results"]))
+        self.assertIsNotNone(first["next"])
+
+        second = self.client.get(first["next"]).json()
+        self.assertEqual(
+            [self.content_match.slug], [post["slug"] for post in second["results"]]
+        )
+        self.assertIsNone(second["next"])
+
+    def test_cursor_pages_through_tied_ranks(self):
+        tied = [
+            PostFactory(
+                title="Checkpoint tuning {}".format(number),
+                publish_date=timezone.now() - timedelta(days=1),
+                status=Post.STATUS.PUBLISH,
+            )
+            for number in range(5)
+        ]
+        slugs = []
+        json = self._search(q="checkpoint", page_size=2)
+        while True:
+            slugs += [post["slug"] for post in json["results"]]
+            if json["next"] is None:
+                break
+            json = self.client.get(json["next"]).json()
+
+        self.assertEqual(sorted(post.slug for post in tied), sorted(slugs))
+
+    def test_vector_is_kept_when_other_fields_change(self):
+        # The instance never loaded the vector the insert trigger wrote.
+        self.title_match.status = Post.STATUS.DRAFT
+        self.title_match.save()
+        self.assertIsNotNone(
+            Post.objects.values_list("search_vector", flat=True).get(
+                pk=self.title_match.pk
+            )
+        )
+
+        self.title_match.status = Post.STATUS.PUBLISH
+        self.title_match.save()
+        self.assertEqual(
+            self.title_match.slug, self._search(q="tuning")["results"][0]["slug"]
+        )
+
+        self.title_match.title = "Tuning checkpoints"
+        self.title_match.save()
+        json = self._search(q="checkpoints")
+        self.assertEqual(
+            [self.title_match.slug], [post["slug"] for post in json["results"]]
+        )
@@ -0,0 +1,98 @@
+from datetime import timedelta
+from unittest import mock
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from blog_app.blog.api.v1 import throttling
+from blog_app.blog.cache import get_cache
+from blog_app.blog.factories import PostFactory
+from blog_app.blog.models import Comment, Post
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+THROTTLING = {
+    "ENABLED": True,
+    "RATES": {"ip": "1/min", "post": "1/min"},
+    "BURSTS": {"ip": 3, "post": 10},
+    "DUPLICATE_WINDOW": 60,
+}
+
+
+@override_settings(BLOG_COMMENT_THROTTLING=THROTTLING)
+class CommentThrottlingTest(APITestCase):
+    def setUp(self) -> None:
+        get_cache().clear()
+        self.posts = [
+            PostFactory(
+                publish_date=timezone.now() - timedelta(days=1),
+                status=Post.STATUS.PUBLISH,
+            )
+            for _ in range(2)
+        ]
+        self.number = 0
+
+    def _post_comment(self, post=None, body=None, **extra):
+        self.number += 1
+        path = reverse("api_v1:post_comments", args=((post or self.posts[0]).slug,))
+        data = {
+            "name": "name",
+            "email": "name@example.com",
+            "body": body or "body {}".format(self.number),
+        }
+        return self.client.post(path, data, **extra)
+
+    def test_ip_bucket_allows_burst_then_throttles(self):
+        statuses = [self._post_comment().status_code for _ in range(4)]
+
+        self.assertEqual([status.HTTP_201_CREATED] * 3, statuses[:3])
+        self.assertEqual(status.HTTP_429_TOO_MANY_REQUESTS, statuses[3])
+        self.assertEqual(3, Comment.objects.count())
+
+    def test_throttled_request_does_not_query_database(self):
+        for _ in range(3):
+            self._post_comment()
+        with CaptureQueriesContext(connection) as context:
+            response = self._post_comment()
+
+        self.assertEqual(status.HTTP_429_TOO_MANY_REQUESTS, response.status_code)
+        self.assertEqual(0, len(context.captured_queries))
+        self.assertIn("Retry-After", response)
+
+    def test_bucket_refills(self):
+        with mock.patch.object(throttling.time, "time", return_value=1000.0):
+            for _ in range(3):
+                self._post_comment()
+            self.assertEqual(429, self._post_comment().status_code)
+        with mock.patch.object(throttling.time, "time", return_value=1061.0):
+            self.assertEqual(201, self._post_comment().status_code)
+
+    @override_settings(
+        BLOG_COMMENT_THROTTLING=dict(THROTTLING, BURSTS={"ip": 10, "post": 2})
+    )
+    def test_post_bucket_is_per_post(self):
+        statuses = [
+            self._post_comment(REMOTE_ADDR="10.0.0.{}".format(i)).status_code
+            for i in range(3)
+        ]
+        self.assertEqual([201, 201, 429], statuses)
+        self.assertEqual(201, self._post_comment(self.posts[1]).status_code)
+
+    def test_duplicate_comment_is_rejected(self):
+        self.assertEqual(201, self._post_comment(body="Same body").status_code)
+        response = self._post_comment(body="Same body")
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        self.assertEqual({"non_field_errors": ["Duplicate comment."]}, response.json())
+        self.assertEqual(1, Comment.objects.count())
+        self.assertEqual(
+            201, self._post_comment(self.posts[1], "Same body").status_code
+        )
+
+    @override_settings(BLOG_COMMENT_THROTTLING={"ENABLED": False})
+    def test_throttling_can_be_disabled(self):
+        statuses = {self._post_comment(body="Same body").status_code for _ in range(5)}
+        self.assertEqual({status.HTTP_201_CREATED}, statuses)
@@ -0,0 +1,39 @@
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_safe
+
+from .api.v1.conditional import (get_not_modified_response, make_etag,
+                                 set_validators)
+from .feeds import get_document
+
+CONTENT_TYPES = {
+    "rss.xml": "application/rss+xml; charset=utf-8",
+    "atom.xml": "application/atom+xml; charset=utf-8",
+    "sitemap.xml": "application/xml; charset=utf-8",
+}
+
+
+def document_view(name):
+    """
+    Serve the document `name` built by blog_build_feeds with ETag and
+    Last-Modified.
+    """
+
+    @require_safe
+    def view(request):
+        document = get_document(name)
+        if document is None:
+            raise Http404("The feeds have not been built yet.")
+        content, fingerprint, last_modified = document
+        etag = make_etag(fingerprint, name)
+        not_modified = get_not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        response = HttpResponse(content, content_type=CONTENT_TYPES[name])
+        return set_validators(response, etag, last_modified)
+
+    return view
+
+
+rss_feed_view = document_view("rss.xml")
+atom_feed_view = document_view("atom.xml")
+sitemap_view = document_view("sitemap.xml")
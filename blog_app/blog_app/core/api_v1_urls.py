@@ -1,9 +1,20 @@
-from blog_app.blog.api.v1 import (comments_list_view, post_lists_view,
-                                  post_retrieve_view)
+from blog_app.blog.api.v1 import (comments_list_view, post_archive_month_view,
+                                  post_archive_view, post_batch_view,
+                                  post_lists_view, post_retrieve_view,
+                                  post_search_view)
 from django.urls import path
 
 urlpatterns = [
     path("posts/", post_lists_view, name="posts"),
+    path("posts/search", post_search_view, name="post_search"),
+    path("posts/batch", post_batch_view, name="post_batch"),
+    # A slug cannot contain "/", so only the month listing can stay here.
+    path(
+        "posts/archive/<int:year>/<int:month>/",
+        post_archive_month_view,
+        name="post_archive_month",
+    ),
     path("posts/<slug:slug>/", post_retrieve_view, name="post"),
     path("posts/<slug:slug>/comments", comments_list_view, name="post_comments",),
+    path("archive/", post_archive_view, name="post_archive"),
 ]
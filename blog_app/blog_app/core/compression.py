@@ -0,0 +1,97 @@
+import gzip
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+def get_compression_settings():
+    return getattr(settings, "BLOG_API_COMPRESSION", {})
+
+
+def is_compression_enabled(request):
+    options = get_compression_settings()
+    return options.get("ENABLED", False) and request.path.startswith(
+        options.get("PATH_PREFIX", "/api/v1/")
+    )
+
+
+def get_encodings():
+    """
+    Supported content codings, in order of preference.
+    """
+    options = get_compression_settings()
+    encodings = {}
+    if brotli is not None:
+        quality = options.get("BROTLI_QUALITY", 5)
+        encodings["br"] = lambda content: brotli.compress(content, quality=quality)
+    level = options.get("GZIP_LEVEL", 6)
+    encodings["gzip"] = lambda content: gzip.compress(
+        content, compresslevel=level, mtime=0
+    )
+    return encodings
+
+
+def is_compressible(content):
+    return len(content) >= get_compression_settings().get("MIN_SIZE", 1024)
+
+
+def compress(content, encodings=None):
+    """
+    Return `content` compressed with each of `encodings` (all supported ones by
+    default), leaving out those that do not make it smaller.
+    """
+    variants = {}
+    if not is_compressible(content):
+        return variants
+    for encoding, compressor in get_encodings().items():
+        if encodings is not None and encoding not in encodings:
+            continue
+        compressed = compressor(content)
+        if len(compressed) < len(content):
+            variants[encoding] = compressed
+    return variants
+
+
+def get_accepted_encoding(request, available):
+    """
+    Pick the coding of `available` the client weights highest in its
+    `Accept-Encoding` header, preferring the order of `available` on ties.
+    """
+    weights = {}
+    for item in request.META.get("HTTP_ACCEPT_ENCODING", "").split(","):
+        coding, *params = item.split(";")
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if coding.strip():
+            weights[coding.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def encode_response(response, encoding, content):
+    """
+    Replace the body of `response` with `content` compressed with `encoding`.
+    """
+    response.content = content
+    response["Content-Length"] = str(len(content))
+    response["Content-Encoding"] = encoding
+    # The compressed bytes differ, but they are still the same representation.
+    etag = response.get("ETag")
+    if etag and etag.startswith('"'):
+        response["ETag"] = "W/" + etag
+    return response
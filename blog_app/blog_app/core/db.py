@@ -0,0 +1,73 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY_UNTIL_KEY = "db:primary_until"
+
+_use_replica = ContextVar("use_replica", default=False)
+
+
+def get_routing_settings():
+    return getattr(settings, "BLOG_DATABASE_ROUTING", {})
+
+
+def note_write():
+    """
+    Read from the primary for every client during
+    BLOG_DATABASE_ROUTING["PIN_SECONDS"] after a write, so responses cached
+    meanwhile are not read from a replica that has not replayed it yet.
+    """
+    options = get_routing_settings()
+    if options.get("REPLICAS"):
+        seconds = options.get("PIN_SECONDS", 5)
+        _get_cache().set(PRIMARY_UNTIL_KEY, time.time() + seconds, seconds)
+
+
+def replicas_may_lag():
+    return _get_cache().get(PRIMARY_UNTIL_KEY, 0) > time.time()
+
+
+def _get_cache():
+    # The blog cache, which every process must share (see blog.checks). It is
+    # imported here as blog.cache records writes with note_write().
+    from blog_app.blog.cache import get_cache
+
+    return get_cache()
+
+
+@contextmanager
+def use_replica():
+    """
+    Send the reads made in the block to a replica, if any is configured.
+    """
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Route reads made inside `use_replica()` to a random database of
+    BLOG_DATABASE_ROUTING["REPLICAS"] and everything else to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = get_routing_settings().get("REPLICAS", [])
+        if replicas and _use_replica.get():
+            return random.choice(replicas)
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
@@ -0,0 +1,157 @@
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+
+from .compression import (compress, encode_response, get_accepted_encoding,
+                          get_encodings, is_compressible, is_compression_enabled)
+from .db import get_routing_settings, replicas_may_lag, use_replica
+from .timing import start_request_timings, stop_request_timings
+
+logger = logging.getLogger("blog_app.timing")
+PIN_COOKIE_SALT = "blog_app.core.middleware.ReplicaRoutingMiddleware"
+
+
+class ServerTimingMiddleware:
+    """
+    Report DB, serializer and view time of sampled requests in a
+    `Server-Timing` header, and optionally log their slowest queries.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        options = getattr(settings, "BLOG_SERVER_TIMING", {})
+        if not self._is_sampled(request, options):
+            return self.get_response(request)
+
+        slow_queries = options.get("SLOW_QUERIES", 0)
+        timings, token = start_request_timings(keep_queries=slow_queries > 0)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(timings.execute_wrapper)
+                    )
+                start = time.perf_counter()
+                response = self.get_response(request)
+                timings.add("view", (time.perf_counter() - start) * 1000)
+        finally:
+            stop_request_timings(token)
+
+        response["Server-Timing"] = self._header(timings)
+        if slow_queries:
+            self._log_slow_queries(request, timings, slow_queries)
+        return response
+
+    def _is_sampled(self, request, options):
+        return (
+            options.get("ENABLED", False)
+            and request.path.startswith(options.get("PATH_PREFIX", "/api/v1/"))
+            and random.random() < options.get("SAMPLE_RATE", 1.0)
+        )
+
+    def _header(self, timings):
+        metrics = [
+            'db;dur={:.2f};desc="{} queries"'.format(
+                timings.db_time, timings.query_count
+            )
+        ]
+        for name, duration in timings.durations.items():
+            metrics.append("{};dur={:.2f}".format(name, duration))
+        return ", ".join(metrics)
+
+    def _log_slow_queries(self, request, timings, number):
+        match = getattr(request, "resolver_match", None)
+        view_name = match.view_name if match else request.path
+        for duration, sql in timings.slowest_queries(number):
+            logger.info("%s %.2fms %s", view_name, duration, sql)
+
+
+class CompressionMiddleware:
+    """
+    Compress API responses with the best coding the client accepts.
+
+    Responses already encoded, like those served from the response cache with
+    their stored compressed body, are left untouched.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            not is_compression_enabled(request)
+            or response.streaming
+            or response.has_header("Content-Encoding")
+            or not is_compressible(response.content)
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = get_accepted_encoding(request, get_encodings())
+        if encoding is None:
+            return response
+        variants = compress(response.content, [encoding])
+        if encoding in variants:
+            encode_response(response, encoding, variants[encoding])
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Serve safe API requests from the read replicas.
+
+    A successful write pins the client to the primary for
+    BLOG_DATABASE_ROUTING["PIN_SECONDS"] with a signed cookie, so it reads its own
+    writes, like a new comment, despite replica lag. Other clients read from
+    the primary for as long after data changed (see `note_write()`), as the
+    responses they miss are stored in caches every client reads.
+    """
+
+    safe_methods = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        options = get_routing_settings()
+        if not options.get("REPLICAS") or not request.path.startswith(
+            options.get("PATH_PREFIX", "/api/v1/")
+        ):
+            return self.get_response(request)
+
+        if request.method in self.safe_methods:
+            if self._is_pinned(request, options) or replicas_may_lag():
+                return self.get_response(request)
+            with use_replica():
+                return self.get_response(request)
+
+        response = self.get_response(request)
+        if response.status_code < 400:
+            pin_seconds = options.get("PIN_SECONDS", 5)
+            response.set_signed_cookie(
+                options.get("PIN_COOKIE", "primary_pin"),
+                str(int(time.time()) + pin_seconds),
+                salt=PIN_COOKIE_SALT,
+                max_age=pin_seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def _is_pinned(self, request, options):
+        # Unsigned cookies are ignored, so clients cannot pin themselves.
+        value = request.get_signed_cookie(
+            options.get("PIN_COOKIE", "primary_pin"), default=None, salt=PIN_COOKIE_SALT
+        )
+        try:
+            return int(value) > time.time()
+        except (TypeError, ValueError):
+            return False
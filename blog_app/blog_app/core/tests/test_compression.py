@@ -0,0 +1,99 @@
+import gzip
+from datetime import timedelta
+from unittest import mock, skipUnless
+
+from rest_framework.test import APITestCase
+
+from blog_app.blog.cache import get_cache
+from blog_app.blog.factories import PostFactory
+from blog_app.blog.models import Post
+from blog_app.core import compression
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+COMPRESSION = {
+    "ENABLED": True,
+    "PATH_PREFIX": "/api/v1/",
+    "MIN_SIZE": 1024,
+    "GZIP_LEVEL": 6,
+    "BROTLI_QUALITY": 5,
+}
+
+
+class AcceptedEncodingTest(SimpleTestCase):
+    def _accepted(self, header, available=("br", "gzip")):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=header)
+        return compression.get_accepted_encoding(request, available)
+
+    def test_server_preference_wins_on_equal_weights(self):
+        self.assertEqual("br", self._accepted("gzip, deflate, br"))
+
+    def test_client_weights_are_respected(self):
+        self.assertEqual("gzip", self._accepted("br;q=0.5, gzip"))
+        self.assertEqual("gzip", self._accepted("br;q=0, *"))
+        self.assertIsNone(self._accepted("gzip;q=0, identity"))
+        self.assertIsNone(self._accepted(""))
+
+
+@override_settings(BLOG_API_COMPRESSION=COMPRESSION)
+class CompressionTest(APITestCase):
+    def setUp(self) -> None:
+        get_cache().clear()
+        self.post = PostFactory(
+            content="Large and repetitive content. " * 200,
+            publish_date=timezone.now() - timedelta(days=1),
+            status=Post.STATUS.PUBLISH,
+        )
+        self.path = reverse("api_v1:post", args=(self.post.slug,))
+
+    def _get(self, encoding="gzip", **kwargs):
+        return self.client.get(self.path, HTTP_ACCEPT_ENCODING=encoding, **kwargs)
+
+    @override_settings(BLOG_API_CACHE={"ENABLED": False})
+    def test_uncached_response_is_compressed(self):
+        identity = self.client.get(self.path)
+        response = self._get()
+
+        self.assertEqual("gzip", response["Content-Encoding"])
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(identity.content, gzip.decompress(response.content))
+        self.assertEqual("W/" + identity["ETag"], response["ETag"])
+
+    @override_settings(BLOG_API_CACHE={"ENABLED": False})
+    def test_response_below_min_size_is_not_compressed(self):
+        self.post.content = "Short"
+        self.post.save()
+        response = self._get()
+
+        self.assertNotIn("Content-Encoding", response)
+
+    def test_cached_response_reuses_compressed_body(self):
+        first = self._get()
+        with mock.patch.object(compression, "get_encodings") as get_encodings:
+            with self.assertNumQueries(0):
+                second = self._get()
+
+        get_encodings.assert_not_called()
+        self.assertEqual("gzip", second["Content-Encoding"])
+        self.assertEqual(first.content, second.content)
+        self.assertIn("Accept-Encoding", second["Vary"])
+
+    def test_cached_response_is_sent_uncompressed_when_not_accepted(self):
+        compressed = self._get()
+        response = self._get(encoding="identity")
+
+        self.assertNotIn("Content-Encoding", response)
+        self.assertEqual(gzip.decompress(compressed.content), response.content)
+
+    def test_weak_etag_answers_conditional_get(self):
+        etag = self._get()["ETag"]
+        response = self._get(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(304, response.status_code)
+
+    @skipUnless(compression.brotli, "brotli is not installed")
+    def test_brotli_is_preferred(self):
+        response = self._get(encoding="gzip, br")
+
+        self.assertEqual("br", response["Content-Encoding"])
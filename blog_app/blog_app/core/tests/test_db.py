@@ -0,0 +1,167 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from blog_app.blog.factories import CommentFactory, PostFactory
+from blog_app.blog.models import Comment, Post
+from blog_app.core import db
+from blog_app.core.db import PrimaryReplicaRouter, note_write, use_replica
+from blog_app.core.middleware import ReplicaRoutingMiddleware
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+db_for_read = PrimaryReplicaRouter.db_for_read
+ROUTING = {
+    "REPLICAS": ["replica"],
+    "PATH_PREFIX": "/api/v1/",
+    "PIN_SECONDS": 5,
+    "PIN_COOKIE": "primary_pin",
+}
+
+
+@override_settings(BLOG_DATABASE_ROUTING=ROUTING)
+class PrimaryReplicaRouterTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.router = PrimaryReplicaRouter()
+
+    def test_reads_go_to_primary_outside_replica_block(self):
+        self.assertEqual("default", self.router.db_for_read(Post))
+
+    def test_reads_go_to_replica_inside_replica_block(self):
+        with use_replica():
+            self.assertEqual("replica", self.router.db_for_read(Post))
+            self.assertEqual("default", self.router.db_for_write(Post))
+        self.assertEqual("default", self.router.db_for_read(Post))
+
+    @override_settings(BLOG_DATABASE_ROUTING=dict(ROUTING, REPLICAS=[]))
+    def test_reads_go_to_primary_without_replicas(self):
+        with use_replica():
+            self.assertEqual("default", self.router.db_for_read(Post))
+
+    def test_migrations_run_on_primary_only(self):
+        self.assertTrue(self.router.allow_migrate("default", "blog"))
+        self.assertFalse(self.router.allow_migrate("replica", "blog"))
+
+
+@override_settings(BLOG_DATABASE_ROUTING=ROUTING)
+class ReplicaRoutingMiddlewareTest(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.factory = RequestFactory()
+        self.status_code = status.HTTP_200_OK
+
+    def _get_response(self, request):
+        # Record where the view would read from.
+        self.read_db = router.db_for_read(Post)
+        return HttpResponse(status=self.status_code)
+
+    def _call(self, request):
+        return ReplicaRoutingMiddleware(self._get_response)(request)
+
+    def test_safe_api_requests_read_from_replica(self):
+        self._call(self.factory.get("/api/v1/posts/"))
+        self.assertEqual("replica", self.read_db)
+
+    def test_requests_outside_api_read_from_primary(self):
+        self._call(self.factory.get("/admin/"))
+        self.assertEqual("default", self.read_db)
+
+    def test_write_pins_client_to_primary(self):
+        response = self._call(self.factory.post("/api/v1/posts/slug/comments"))
+        self.assertEqual("default", self.read_db)
+
+        request = self.factory.get("/api/v1/posts/slug/comments")
+        request.COOKIES["primary_pin"] = response.cookies["primary_pin"].value
+        self._call(request)
+        self.assertEqual("default", self.read_db)
+
+    def test_failed_write_does_not_pin(self):
+        self.status_code = status.HTTP_400_BAD_REQUEST
+        response = self._call(self.factory.post("/api/v1/posts/slug/comments"))
+        self.assertNotIn("primary_pin", response.cookies)
+
+    def test_expired_pin_reads_from_replica(self):
+        request = self.factory.get("/api/v1/posts/")
+        request.COOKIES["primary_pin"] = "1"
+        self._call(request)
+        self.assertEqual("replica", self.read_db)
+
+    def test_unsigned_pin_reads_from_replica(self):
+        request = self.factory.get("/api/v1/posts/")
+        request.COOKIES["primary_pin"] = str(int(time.time()) + 60)
+        self._call(request)
+        self.assertEqual("replica", self.read_db)
+
+    def test_write_is_noted_in_blog_cache(self):
+        blog_cache = LocMemCache("blog", {})
+        with mock.patch("blog_app.blog.cache.get_cache", return_value=blog_cache):
+            note_write()
+            self.assertTrue(db.replicas_may_lag())
+        self.assertIsNotNone(blog_cache.get(db.PRIMARY_UNTIL_KEY))
+        self.assertFalse(db.replicas_may_lag())
+
+    def test_every_client_reads_from_primary_after_a_write(self):
+        note_write()
+        self._call(self.factory.get("/api/v1/posts/"))
+        self.assertEqual("default", self.read_db)
+
+        later = time.time() + 6
+        with mock.patch.object(db.time, "time", return_value=later):
+            self._call(self.factory.get("/api/v1/posts/"))
+        self.assertEqual("replica", self.read_db)
+
+
+@override_settings(BLOG_DATABASE_ROUTING=ROUTING)
+class ReplicaLagTest(APITestCase):
+    def setUp(self) -> None:
+        self.post = PostFactory(
+            publish_date=timezone.now() - timedelta(days=1),
+            status=Post.STATUS.PUBLISH,
+        )
+        self.path = reverse("api_v1:post_comments", args=(self.post.slug,))
+        self.reads = []
+        cache.clear()
+
+    def _db_for_read(self, model, **hints):
+        alias = db_for_read(PrimaryReplicaRouter(), model, **hints)
+        self.reads.append(alias)
+        return alias
+
+    def test_other_clients_read_a_write_from_primary(self):
+        # A moderator publishes a comment in the admin.
+        CommentFactory(post=self.post, published=True)
+
+        with mock.patch.object(PrimaryReplicaRouter, "db_for_read", self._db_for_read):
+            response = self.client_class().get(self.path)
+
+        self.assertEqual(1, len(response.json()["results"]))
+        self.assertEqual({"default"}, set(self.reads))
+
+
+@override_settings(
+    BLOG_DATABASE_ROUTING=dict(ROUTING, REPLICAS=["default"]),
+    BLOG_COMMENT_THROTTLING={"ENABLED": False},
+)
+class ReadYourCommentsTest(APITestCase):
+    def test_comment_post_sets_pin_cookie(self):
+        post = PostFactory(
+            publish_date=timezone.now() - timedelta(days=1),
+            status=Post.STATUS.PUBLISH,
+        )
+        path = reverse("api_v1:post_comments", args=(post.slug,))
+        response = self.client.post(
+            path, {"name": "name", "email": "name@example.com", "body": "body"}
+        )
+
+        self.assertEqual(status.HTTP_201_CREATED, response.status_code)
+        self.assertIn("primary_pin", response.cookies)
+        self.assertEqual(5, response.cookies["primary_pin"]["max-age"])
+        self.assertEqual(1, Comment.objects.count())
@@ -0,0 +1,63 @@
+import re
+from datetime import timedelta
+
+from rest_framework.test import APITestCase
+
+from blog_app.blog.factories import PostFactory
+from blog_app.blog.models import Post
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+SERVER_TIMING = {
+    "ENABLED": True,
+    "SAMPLE_RATE": 1.0,
+    "PATH_PREFIX": "/api/v1/",
+    "SLOW_QUERIES": 0,
+}
+
+
+@override_settings(BLOG_SERVER_TIMING=SERVER_TIMING, BLOG_API_CACHE={"ENABLED": False})
+class ServerTimingMiddlewareTest(APITestCase):
+    def setUp(self) -> None:
+        self.post = PostFactory(
+            publish_date=timezone.now() - timedelta(days=1),
+            status=Post.STATUS.PUBLISH,
+        )
+        self.path = reverse("api_v1:post", args=(self.post.slug,))
+
+    def _metrics(self, response):
+        return {
+            match.group(1): match.group(0)
+            for match in re.finditer(r"(\w+);dur=[\d.]+", response["Server-Timing"])
+        }
+
+    def test_header_reports_db_serializer_and_view_time(self):
+        response = self.client.get(self.path)
+        metrics = self._metrics(response)
+
+        self.assertSetEqual({"db", "serializer", "view"}, set(metrics))
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
+
+    def test_requests_outside_api_are_not_timed(self):
+        response = self.client.get("/admin/login/")
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(BLOG_SERVER_TIMING=dict(SERVER_TIMING, SAMPLE_RATE=0))
+    def test_requests_are_sampled(self):
+        response = self.client.get(self.path)
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(BLOG_SERVER_TIMING=dict(SERVER_TIMING, ENABLED=False))
+    def test_disabled(self):
+        response = self.client.get(self.path)
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(BLOG_SERVER_TIMING=dict(SERVER_TIMING, SLOW_QUERIES=1))
+    def test_slowest_queries_are_logged_with_view_name(self):
+        with self.assertLogs("blog_app.timing", level="INFO") as logs:
+            self.client.get(self.path)
+
+        self.assertEqual(1, len(logs.output))
+        self.assertIn("api_v1:post", logs.output[0])
+        self.assertIn("blog_post", logs.output[0])
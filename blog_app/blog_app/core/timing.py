@@ -0,0 +1,61 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    """
+    Durations collected while a request is handled, in milliseconds.
+    """
+
+    def __init__(self, keep_queries=False):
+        self.keep_queries = keep_queries
+        self.durations = {}
+        self.query_count = 0
+        self.db_time = 0.0
+        self.queries = []
+
+    def add(self, name, duration):
+        self.durations[name] = self.durations.get(name, 0.0) + duration
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - start) * 1000
+            self.query_count += 1
+            self.db_time += duration
+            if self.keep_queries:
+                self.queries.append((duration, sql))
+
+    def slowest_queries(self, number):
+        return sorted(self.queries, key=lambda query: query[0], reverse=True)[:number]
+
+
+def start_request_timings(keep_queries=False):
+    timings = RequestTimings(keep_queries)
+    return timings, _current.set(timings)
+
+
+def stop_request_timings(token):
+    _current.reset(token)
+
+
+@contextmanager
+def measure(name):
+    """
+    Add the time spent in the block to the current request's `name` timing.
+    Does nothing outside a timed request.
+    """
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, (time.perf_counter() - start) * 1000)
@@ -0,0 +1,38 @@
+"""
+ASGI config for blog_app project.
+It exposes the ASGI callable as a module-level variable named ``application``.
+For more information on this file, see
+https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/uvicorn/
+"""
+import os
+import sys
+from pathlib import Path
+
+from django.core.asgi import get_asgi_application
+
+try:
+    from asgiref.sync import ThreadSensitiveContext
+except ImportError:  # asgiref < 3.3 runs every sync view in its own thread
+    ThreadSensitiveContext = None
+
+ROOT_DIR = Path(__file__).resolve(strict=True).parent.parent
+sys.path.append(str(ROOT_DIR / "blog_app"))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
+
+django_application = get_asgi_application()
+
+
+async def application(scope, receive, send):
+    """
+    Serve every request from its own thread, so a request waiting on the
+    database does not hold up the others handled by the process.
+
+    Newer asgiref releases run thread sensitive sync code, which includes all
+    Django 3.0 views, on one shared thread unless each request gets its own
+    context.
+    """
+    if ThreadSensitiveContext is None:
+        return await django_application(scope, receive, send)
+    async with ThreadSensitiveContext():
+        return await django_application(scope, receive, send)
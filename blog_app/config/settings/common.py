@@ -20,6 +20,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "corsheaders",
     # apps
@@ -28,6 +29,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "blog_app.core.middleware.CompressionMiddleware",
+    "blog_app.core.middleware.ServerTimingMiddleware",
+    "blog_app.core.middleware.ReplicaRoutingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -71,7 +75,105 @@ DATABASES = {
         "PORT": os.getenv("POSTGRES_PORT", "5432"),
     }
 }
+# Read replicas of the primary, comma separated hosts
+POSTGRES_REPLICA_HOSTS = [
+    host for host in os.getenv("POSTGRES_REPLICA_HOSTS", "").split(",") if host
+]
+for number, host in enumerate(POSTGRES_REPLICA_HOSTS):
+    DATABASES["replica_{}".format(number)] = dict(
+        DATABASES["default"], HOST=host, TEST={"MIRROR": "default"}
+    )
+DATABASE_ROUTERS = ["blog_app.core.db.PrimaryReplicaRouter"]
+
+# Safe API requests read from the replicas, see blog_app.core.middleware
+BLOG_DATABASE_ROUTING = {
+    "REPLICAS": [alias for alias in DATABASES if alias != "default"],
+    "PATH_PREFIX": "/api/v1/",
+    # Clients read from the primary for this long after a write
+    "PIN_SECONDS": int(os.getenv("BLOG_DATABASE_PIN_SECONDS", 5)),
+    "PIN_COOKIE": "blog_primary_pin",
+}
+
+# Cache
+# LocMemCache is local to each process. Cached responses are invalidated
+# through this cache, so several workers need a shared backend (blog.W001).
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "DJANGO_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("DJANGO_CACHE_LOCATION", ""),
+    }
+}
+
+# Rendered responses of the public API, see blog_app.blog.api.v1.cache
+BLOG_API_CACHE = {
+    "ENABLED": strtobool(os.getenv("BLOG_API_CACHE_ENABLED", "yes")),
+    "CACHE_ALIAS": "default",
+    "TIMEOUT": int(os.getenv("BLOG_API_CACHE_TIMEOUT", 60 * 5)),
+}
+# Slugs without a visible post, answered 404 without a query, see
+# blog_app.blog.negative_cache
+BLOG_NEGATIVE_CACHE = {
+    "ENABLED": strtobool(os.getenv("BLOG_NEGATIVE_CACHE_ENABLED", "yes")),
+    "MAX_SIZE": int(os.getenv("BLOG_NEGATIVE_CACHE_MAX_SIZE", 10000)),
+    # Seconds a slug is remembered, also how long other processes may miss
+    # that its post was published
+    "TIMEOUT": int(os.getenv("BLOG_NEGATIVE_CACHE_TIMEOUT", 30)),
+    # Also remember slugs in the blog cache, shared by all processes
+    "SHARED": strtobool(os.getenv("BLOG_NEGATIVE_CACHE_SHARED", "no")),
+}
+# gzip/brotli encoding of API responses, see blog_app.core.compression
+BLOG_API_COMPRESSION = {
+    "ENABLED": strtobool(os.getenv("BLOG_API_COMPRESSION_ENABLED", "yes")),
+    "PATH_PREFIX": "/api/v1/",
+    # Smaller bodies are sent as they are
+    "MIN_SIZE": int(os.getenv("BLOG_API_COMPRESSION_MIN_SIZE", 1024)),
+    "GZIP_LEVEL": 6,
+    "BROTLI_QUALITY": 5,
+}
+# Server-Timing header on sampled API requests, see blog_app.core.middleware
+BLOG_SERVER_TIMING = {
+    "ENABLED": strtobool(os.getenv("BLOG_SERVER_TIMING_ENABLED", "yes")),
+    "SAMPLE_RATE": float(os.getenv("BLOG_SERVER_TIMING_SAMPLE_RATE", 0.1)),
+    "PATH_PREFIX": "/api/v1/",
+    # Number of slowest queries logged to "blog_app.timing" per sampled request
+    "SLOW_QUERIES": int(os.getenv("BLOG_SERVER_TIMING_SLOW_QUERIES", 0)),
+}
+
+# RSS/Atom feeds and sitemap of published posts, see blog_app.blog.feeds
+BLOG_FEEDS = {
+    "TITLE": os.getenv("BLOG_FEEDS_TITLE", "Blog"),
+    "DESCRIPTION": os.getenv("BLOG_FEEDS_DESCRIPTION", ""),
+    "SITE_URL": os.getenv("BLOG_SITE_URL", "http://localhost:3000"),
+    # Link of a post in the feeds and the sitemap
+    "POST_URL": os.getenv("BLOG_POST_URL", "http://localhost:3000/posts/{slug}"),
+    "ITEMS": int(os.getenv("BLOG_FEEDS_ITEMS", 50)),
+    "DIR": os.getenv("BLOG_FEEDS_DIR", join(BASE_DIR, "feeds")),
+    # Documents replaced by a build are removed after this long
+    "GRACE_SECONDS": int(os.getenv("BLOG_FEEDS_GRACE_SECONDS", 5 * 60)),
+}
+
+# Comment submissions, see blog_app.blog.ingestion
+BLOG_COMMENT_INGESTION = {
+    # "sync" writes each comment in the request, "queued" answers 202 and
+    # leaves the INSERT to the blog_ingest_comments worker.
+    "MODE": os.getenv("BLOG_COMMENT_INGESTION_MODE", "sync"),
+    "QUEUE": "blog_app.blog.ingestion.DatabaseCommentQueue",
+    "QUEUE_OPTIONS": {},
+    "BATCH_SIZE": int(os.getenv("BLOG_COMMENT_INGESTION_BATCH_SIZE", 500)),
+}
 
+# Spam control of comment submissions, see blog_app.blog.api.v1.throttling
+BLOG_COMMENT_THROTTLING = {
+    "ENABLED": strtobool(os.getenv("BLOG_COMMENT_THROTTLING_ENABLED", "yes")),
+    # Token buckets per client IP and per post: BURSTS submissions at once,
+    # then RATES.
+    "RATES": {"ip": "6/min", "post": "60/min"},
+    "BURSTS": {"ip": 3, "post": 30},
+    # Seconds during which the same (post, email, body) is rejected
+    "DUPLICATE_WINDOW": int(os.getenv("BLOG_COMMENT_DUPLICATE_WINDOW", 60 * 10)),
+}
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -1,3 +1,4 @@
+from blog_app.blog.views import atom_feed_view, rss_feed_view, sitemap_view
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
@@ -8,6 +9,9 @@ urlpatterns = [
     path(
         "api/v1/", include(("blog_app.core.api_v1_urls", "api_v1"), namespace="api_v1")
     ),
+    path("feeds/rss.xml", rss_feed_view, name="rss_feed"),
+    path("feeds/atom.xml", atom_feed_view, name="atom_feed"),
+    path("sitemap.xml", sitemap_view, name="sitemap"),
 ] + static(settings.STATIC_URL, document_root=settings.STATIC_URL)
 
 